@@ -1,9 +1,17 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+import logging
 import os
+import threading
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+from modules.router import DEFAULT_PAGE, NEXT_PAGES, PAGES, current_page, navigate, page_functions, show_page, sidebar_pages
+
+# pandas, Plotly and the data modules are imported inside the functions that need them,
+# so the login page renders without them while the warm-up thread imports them.
+
+logger = logging.getLogger(__name__)
+
+# Storage backend: 'csv' reads the data directory, 'sqlite' an indexed database synced from it
+STORAGE_BACKEND = os.environ.get('MENTORSHIP_STORAGE', 'csv')
 
 # Page config
 st.set_page_config(
@@ -220,33 +228,90 @@ if 'user_role' not in st.session_state:
 if 'selected_mentor' not in st.session_state:
     st.session_state.selected_mentor = None
  
-# Load data function
-@st.cache_data
+# Load data function (room for two versions of each of the 12 tables)
+@st.cache_resource(show_spinner=False, max_entries=24)
+def load_table(name, signature):
+    """Load one table, shared read-only by all sessions; the signature gives each CSV version its own entry"""
+    from modules.data_cache import read_table
+    return read_table(name)
+
+@st.cache_resource(show_spinner=False, max_entries=24)
+def load_sql_table(name, signature):
+    """Load one table from the SQLite backend, cached per CSV version like load_table"""
+    from modules.sql_store import read_sql_table
+    return read_sql_table(name)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def sync_sql_database(signature):
+    """Bring the SQLite database up to date once per data version, not on every run"""
+    from modules.sql_store import sync_database
+    sync_database()
+
+def use_copy_on_write():
+    """Pages get shallow views of the shared cached frames. Copy-on-write (the default from
+    pandas 3) keeps a page's edits from reaching them; it is set for the app process only."""
+    import pandas as pd
+    if int(pd.__version__.split('.')[0]) < 3:
+        pd.set_option('mode.copy_on_write', True)
+
+def open_data():
+    """All tables as a lazy mapping on the configured backend - each table is only read when a page uses it"""
+    use_copy_on_write()
+    if STORAGE_BACKEND == 'sqlite':
+        from modules.data_cache import TABLES, table_signature
+        from modules.sql_store import SQLData
+        sync_sql_database(tuple(table_signature(name) for name in TABLES))
+        return SQLData(load_sql_table)
+    from modules.data_cache import LazyData
+    return LazyData(load_table)
+
 def load_data():
-    """Load all CSV data files"""
-    data = {}
-    data_dir = "data"
-    
+    """Return all tables as a lazy mapping, or None when a data file is missing"""
+    from modules.data_cache import TABLES, table_signature
     try:
-        data['mentors'] = pd.read_csv(f"{data_dir}/mentors.csv")
-        data['pairings'] = pd.read_csv(f"{data_dir}/pairings.csv")
-        data['goals'] = pd.read_csv(f"{data_dir}/goals.csv")
-        data['engagement'] = pd.read_csv(f"{data_dir}/engagement.csv")
-        data['resources'] = pd.read_csv(f"{data_dir}/resources.csv")
-        data['participation'] = pd.read_csv(f"{data_dir}/participation.csv")
-        data['leadership_profiles'] = pd.read_csv(f"{data_dir}/leadership_profiles.csv")
-        data['all_participants'] = pd.read_csv(f"{data_dir}/all_participants.csv")
-        data['enhanced_engagement'] = pd.read_csv(f"{data_dir}/enhanced_engagement.csv")
-        data['session_notes'] = pd.read_csv(f"{data_dir}/session_notes.csv")
-        data['mentees_real_data'] = pd.read_csv(f"{data_dir}/mentees_real_data.csv")
-        data['mentors_real_data'] = pd.read_csv(f"{data_dir}/mentors_real_data.csv")
+        for name in TABLES:
+            table_signature(name)
     except FileNotFoundError as e:
         st.error(f"Data file not found: {e}")
         return None
-    
-    return data
+    return open_data()
+
+def _warm_up():
+    """Import every page module and prime the derived tables of the page shown after login"""
+    for page in PAGES:
+        try:
+            page_functions(page)
+        except Exception:
+            # A page that is never opened would otherwise hide its import error until someone does
+            logger.exception("Warm-up could not import page %r", page)
+    try:
+        from modules.derived_data import PAGE_DATA, get_profiler
+        get_profiler()
+        data = open_data()
+        for task in PAGE_DATA.get(DEFAULT_PAGE, {}).values():
+            task(data)
+    except Exception:
+        logger.exception("Warm-up could not prime the %r caches", DEFAULT_PAGE)
+
+@st.cache_resource(show_spinner=False)
+def start_warmup():
+    """Start the warm-up once per server process, in the background while the user logs in
+
+    The thread carries the script context of the session that triggered it (the first
+    login page of the process), stored with it in this process-wide cache. The context
+    only lets it use the Streamlit caches; the warm-up never renders anything into
+    that session.
+    """
+    thread = threading.Thread(target=_warm_up, name='warmup', daemon=True)
+    add_script_run_ctx(thread)
+    thread.start()
+    return thread
 
 # Authentication simulation
+def set_user_role(role):
+    """Login/logout button callback; runs before the next script run, so no extra rerun is needed"""
+    st.session_state.user_role = role
+
 def show_login():
     st.title("🎯 Ivy Leadership & Mentorship Dashboard")
     st.markdown("### *Empowering leadership through connected, data-driven mentorship*")
@@ -267,9 +332,7 @@ def show_login():
         # Only HR/Admin login available
         st.markdown("**HR/Admin Access**")
         
-        if st.button("Login as HR/Admin", type="primary"):
-            st.session_state.user_role = "HR"
-            st.rerun()
+        st.button("Login as HR/Admin", type="primary", on_click=set_user_role, args=("HR",))
 
 def show_sidebar():
     """Show navigation sidebar"""
@@ -279,67 +342,53 @@ def show_sidebar():
         # User info
         st.success("👤 Logged in as: **HR/Admin**")
         
-        if st.button("Logout"): 
-            st.session_state.user_role = None
-            st.rerun()
+        st.button("Logout", on_click=set_user_role, args=(None,))
         
         st.markdown("---")
         
-        # Navigation menu - HR/Admin only
-        pages = {
-            "HR Dashboard": "hr_dashboard",  
-            "All Participants": "mentor_eligibility", 
-            "Progress Tracker": "progress_tracker",
-            "Resource Library": "resource_library"
-        }
-        
-        # Initialize selected page in session state if not exists
-        if 'selected_page' not in st.session_state:
-            st.session_state.selected_page = "hr_dashboard"
-        
-        # Create navigation buttons
-        for page_name, page_key in pages.items():
-            if st.button(page_name, key=f"nav_{page_key}", use_container_width=True):
-                st.session_state.selected_page = page_key
-                st.rerun()
+        # Navigation menu - HR/Admin only; the callback switches page before the next run
+        for page_name, page_key in sidebar_pages().items():
+            st.button(page_name, key=f"nav_{page_key}", use_container_width=True,
+                      on_click=navigate, args=(page_key,))
         
-        return st.session_state.selected_page
+        return current_page()
 
 def main():
     # Check if user is logged in
     if st.session_state.user_role is None:
         show_login()
+        start_warmup()
         return
     
-    # Load data
-    data = load_data()
-    if data is None:
-        st.error("Unable to load application data. Please check data files.")
-        return
+    from modules.derived_data import get_prefetcher, get_profiler, prefetch_pages
+    from modules.performance_panel import show_performance_panel
+    
+    # Tables still queued for this session's previous page give way to this run
+    get_prefetcher().cancel(st.session_state.pop('prefetch', []))
+    
+    # Every section timed below ends up in the HR performance panel and the profile log;
+    # the run is logged even when the data fails to load or the page raises
+    profiler = get_profiler()
+    with profiler.run(current_page()):
+        # Load data
+        with profiler.span("data load"):
+            data = load_data()
+        if data is None:
+            st.error("Unable to load application data. Please check data files.")
+            return
+        
+        # Show sidebar and get selected page
+        selected_page = show_sidebar()
+        
+        # Show selected page (page modules are imported on first use)
+        with profiler.span(f"page: {selected_page}"):
+            show_page(selected_page, data)
     
-    # Show sidebar and get selected page
-    selected_page = show_sidebar()
+    if st.session_state.user_role == "HR":
+        show_performance_panel(profiler)
     
-    # Import and show selected page
-    if selected_page == "hr_dashboard":
-        from modules.hr_dashboard import show_hr_dashboard
-        show_hr_dashboard(data)
-    elif selected_page == "mentor_eligibility":
-        from modules.mentor_eligibility import show_mentor_eligibility
-        show_mentor_eligibility(data)
-    elif selected_page == "progress_tracker":
-        from modules.progress_tracker import show_progress_tracker
-        show_progress_tracker(data)
-    elif selected_page == "smart_goals":
-        from modules.smart_goals import show_smart_goals
-        show_smart_goals(data)
-    elif selected_page == "resource_library":
-        from modules.resource_library import show_resource_library
-        show_resource_library(data)
-    elif selected_page == "mentor_community":
-        from modules.mentor_community import show_mentor_community
-        show_mentor_community(data)
-        show_resources(data)
+    # With the page on screen, compute the tables of the pages usually opened next
+    st.session_state.prefetch = prefetch_pages(NEXT_PAGES.get(selected_page, []), open_data)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+"""Render page functions headless on synthetic data and report time, memory and payload size
+
+Each (size, page) pair runs in its own process with Streamlit's AppTest, pointed at a
+synthetic data directory through MENTORSHIP_DATA_DIR:
+
+    python -m benchmarks.run_pages --sizes 1000 10000 --pages hr_dashboard mentor_eligibility
+
+Reported per page: the first render (empty caches), a rerun (warm caches), the peak
+resident memory of the process and the size of the rendered element protos.
+
+The default sizes stop at 10,000 participants. Larger ones are opt-in (--sizes 100000):
+generating and rendering them takes minutes per page.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from benchmarks.synthetic_data import generate
+
+PAGES = {
+    'hr_dashboard': 'modules.hr_dashboard:show_hr_dashboard',
+    'mentor_eligibility': 'modules.mentor_eligibility:show_mentor_eligibility',
+    'progress_tracker': 'modules.progress_tracker:show_progress_tracker',
+    'pairings_progress': 'modules.pairings_progress:show_pairings_progress',
+}
+DEFAULT_SIZES = [1000, 10000]
+DATA_ROOT = os.path.join('benchmarks', '.data')
+TIMEOUT = 600
+
+# Script run by AppTest: one page function on the app's data mapping
+PAGE_SCRIPT = """
+import importlib
+import streamlit as st
+from app import load_data
+
+module, function = st.session_state['benchmark_page'].split(':')
+getattr(importlib.import_module(module), function)(load_data())
+"""
+
+
+def data_dir_for(size):
+    """Synthetic data directory for a participant count, generated on first use"""
+    path = os.path.join(DATA_ROOT, f'participants-{size}')
+    if not os.path.exists(os.path.join(path, 'session_notes.csv')):
+        generate(size, path)
+    return path
+
+
+def _payload_bytes(node):
+    """Serialized size of every element proto below an AppTest block (at.main, at.sidebar)"""
+    total = 0
+    proto = getattr(node, 'proto', None)
+    if proto is not None and hasattr(proto, 'ByteSize'):
+        total += proto.ByteSize()
+    for child in getattr(node, 'children', {}).values():
+        total += _payload_bytes(child)
+    return total
+
+
+def _peak_memory_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def measure_page(target):
+    """Render one page twice in this process; returns the measurements as a dict"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_string(PAGE_SCRIPT, default_timeout=TIMEOUT)
+    at.session_state.benchmark_page = target
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - start
+
+    return {
+        'first_render_s': round(first, 3),
+        'rerun_s': round(rerun, 3),
+        'peak_memory_mb': _peak_memory_mb(),
+        'payload_kb': round((_payload_bytes(at.main) + _payload_bytes(at.sidebar)) / 1024, 1),
+        'error': str(at.exception[0].value) if len(at.exception) else None,
+    }
+
+
+def run_page(size, page):
+    """Measure one page in a fresh process so memory and caches start from zero"""
+    env = dict(os.environ, MENTORSHIP_DATA_DIR=data_dir_for(size))
+    try:
+        done = subprocess.run([sys.executable, '-m', 'benchmarks.run_pages', '--worker', PAGES[page]],
+                              env=env, capture_output=True, text=True, timeout=TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return {'error': f'timed out after {TIMEOUT}s'}
+    if done.returncode != 0:
+        return {'error': done.stderr.strip().splitlines()[-1] if done.stderr.strip() else f'exit code {done.returncode}'}
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def _report(results):
+    print(f"{'size':>8}  {'page':<20} {'first (s)':>10} {'rerun (s)':>10} {'peak MB':>9} {'payload KB':>11}")
+    for row in results:
+        if row.get('error') and 'first_render_s' not in row:
+            print(f"{row['size']:>8}  {row['page']:<20} {row['error']}")
+            continue
+        print(f"{row['size']:>8}  {row['page']:<20} {row['first_render_s']:>10} {row['rerun_s']:>10} "
+              f"{row['peak_memory_mb'] or '-':>9} {row['payload_kb']:>11}" + (f"  error: {row['error']}" if row['error'] else ''))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark page render functions on synthetic data")
+    parser.add_argument('--sizes', type=int, nargs='+', help=f"participant counts (default: {DEFAULT_SIZES})")
+    parser.add_argument('--pages', nargs='+', choices=list(PAGES), default=list(PAGES))
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(measure_page(args.worker)))
+        return
+
+    if args.sizes is None:
+        args.sizes = DEFAULT_SIZES
+        print(f"Sizes {DEFAULT_SIZES}; larger ones are opt-in, e.g. --sizes 100000 (minutes per page)")
+    results = []
+    for size in args.sizes:
+        for page in args.pages:
+            results.append(dict(run_page(size, page), size=size, page=page))
+    _report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
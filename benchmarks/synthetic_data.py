@@ -0,0 +1,101 @@
+"""Synthetic copies of the data directory at any participant count
+
+Every table keeps the columns of the real CSV in data/. Values are drawn from the
+real columns, and the names, emails and IDs are generated so the tables still join
+(roster <-> program participants <-> engagement, pairings, goals and session notes).
+
+    python -m benchmarks.synthetic_data 10000 --out benchmarks/.data/participants-10000
+"""
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from modules.data_cache import DATA_DIR, TABLES, read_table, table_path
+
+# Share of participants who are mentors, as in the real rosters
+MENTOR_SHARE = 0.15
+# Rows per mentee in the per-mentee program tables
+GOALS_PER_MENTEE = 0.5
+SESSIONS_PER_MENTEE = 3
+
+
+def _sample(frame, rows, rng):
+    """rows rows whose columns are drawn independently from frame's values"""
+    picks = {c: frame[c].to_numpy()[rng.integers(0, len(frame), rows)] for c in frame.columns}
+    return pd.DataFrame(picks, columns=frame.columns)
+
+
+def _people(count, start, source_names, rng):
+    """Unique names and emails, mixing first and last names from the real rosters"""
+    parts = pd.Series(source_names).dropna().astype(str).str.strip().str.split()
+    first = parts.str[0].to_numpy()
+    last = parts.str[-1].to_numpy()
+    numbers = np.arange(start, start + count)
+    names = (pd.Series(first[rng.integers(0, len(first), count)]) + ' '
+             + pd.Series(last[rng.integers(0, len(last), count)]) + ' ' + pd.Series(numbers).astype(str))
+    emails = names.str.lower().str.replace(' ', '.', regex=False) + '@example.com'
+    return names.to_numpy(), emails.to_numpy(), numbers
+
+
+def generate(participants, out_dir, source_dir=DATA_DIR, seed=0):
+    """Write every table for the given number of roster participants into out_dir"""
+    rng = np.random.default_rng(seed)
+    real = {name: read_table(name, source_dir) for name in TABLES}
+    mentor_count = max(1, int(participants * MENTOR_SHARE))
+    mentee_count = max(1, participants - mentor_count)
+
+    source_names = pd.concat([real['mentors_real_data']['Mentors from LDP'], real['mentees_real_data']['Name ']])
+    mentor_names, mentor_emails, mentor_ids = _people(mentor_count, 1, source_names, rng)
+    mentee_names, mentee_emails, mentee_ids = _people(mentee_count, mentor_count + 1, source_names, rng)
+    names = np.concatenate([mentor_names, mentee_names])
+    roles = np.array(['Mentor'] * mentor_count + ['Mentee'] * mentee_count)
+
+    tables = {}
+    tables['mentors_real_data'] = _sample(real['mentors_real_data'], mentor_count, rng).assign(**{
+        'Mentors from LDP': mentor_names, 'Email': mentor_emails, 'Nesma id': mentor_ids})
+    tables['mentees_real_data'] = _sample(real['mentees_real_data'], mentee_count, rng).assign(**{
+        'Name ': mentee_names, 'Email ': mentee_emails, 'ID': mentee_ids})
+
+    # Program tables cover every roster participant
+    tables['all_participants'] = _sample(real['all_participants'], participants, rng).assign(
+        Name=names, Email=np.concatenate([mentor_emails, mentee_emails]), Role=roles)
+    tables['enhanced_engagement'] = _sample(real['enhanced_engagement'], participants, rng).assign(
+        Participant_Name=names, Role=roles, Cohort=rng.integers(1, 5, participants))
+    tables['engagement'] = _sample(real['engagement'], participants, rng).assign(Name=names, Role=roles)
+    for name in ('mentors', 'leadership_profiles', 'participation'):
+        tables[name] = _sample(real[name], mentor_count, rng).assign(Name=mentor_names)
+
+    pairing_mentors = mentor_names[rng.integers(0, mentor_count, mentee_count)]
+    tables['pairings'] = _sample(real['pairings'], mentee_count, rng).assign(
+        Mentor=pairing_mentors, Mentee=mentee_names,
+        Cohort='Cohort ' + pd.Series(rng.integers(1, 5, mentee_count)).astype(str).to_numpy())
+
+    goal_rows = rng.integers(0, mentee_count, int(mentee_count * GOALS_PER_MENTEE))
+    tables['goals'] = _sample(real['goals'], len(goal_rows), rng).assign(
+        Mentee=mentee_names[goal_rows], Mentor=pairing_mentors[goal_rows])
+
+    session_rows = rng.integers(0, mentee_count, mentee_count * SESSIONS_PER_MENTEE)
+    tables['session_notes'] = _sample(real['session_notes'], len(session_rows), rng).assign(
+        Session_ID=np.arange(1, len(session_rows) + 1),
+        Mentor_Name=pairing_mentors[session_rows], Mentee_Name=mentee_names[session_rows])
+
+    tables['resources'] = _sample(real['resources'], max(len(real['resources']), participants // 100), rng)
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name, frame in tables.items():
+        frame.to_csv(table_path(name, out_dir), index=False)
+    return out_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic data directory with the schemas of data/")
+    parser.add_argument('participants', type=int, help="number of roster participants (mentors and mentees)")
+    parser.add_argument('--out', required=True, help="directory to write the CSVs to")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    generate(args.participants, args.out, seed=args.seed)
+    print(f"{args.participants} participants written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Evaluate every alert rule over the current data and log what changed since the last scan
+
+Run from the project root, e.g. from cron:
+
+    python -m modules.alert_scanner
+
+Each scan is compared with the alerts active at the end of the previous one. New and
+changed alerts, and goal completions found in goals.csv, go to the program event log
+(modules.event_log) that feeds the HR dashboard's Recent Activity; resolved alerts are
+only counted. No Streamlit import is needed.
+"""
+import argparse
+import json
+import os
+from datetime import datetime
+import pandas as pd
+from modules.alerts import ENGAGEMENT_RULES, SCORECARD_RULES, evaluate_rules
+from modules.data_cache import CACHE_DIR, DATA_DIR, read_table
+from modules.engagement_facts import build_engagement_facts
+from modules.event_log import append_events, collect_goal_events
+from modules.session_rollups import participant_rollups, update_session_rollups
+
+SNAPSHOT_FILE = 'alert_snapshot.json'
+# Fields that make an alert "changed" when they differ from the previous scan
+TRACKED_FIELDS = ['severity', 'reason']
+
+
+def _snapshot_path(data_dir):
+    return os.path.join(data_dir, CACHE_DIR, SNAPSHOT_FILE)
+
+
+def _with_emails(scorecard, facts):
+    """Scorecard rows with the Email of the participant they belong to
+
+    The scorecard carries only a name and role; rows whose name and role match more
+    than one participant keep a missing Email.
+    """
+    directory = facts[['Name', 'Role', 'Email']].astype({'Role': object}).drop_duplicates(['Name', 'Role'], keep=False)
+    return scorecard.merge(directory, on=['Name', 'Role'], how='left')
+
+
+def alert_records(alerts):
+    """Alerts frame (with a Source column) as JSON-ready records
+
+    Alerts are keyed by the participant's Email, so participants who share a name keep
+    separate alerts; Name is only shown. Rows without an Email fall back to role and name.
+    """
+    records = []
+    for alert in alerts.where(alerts.notna(), None).to_dict('records'):
+        participant = alert['Email'] or f"{alert['Role']}:{alert['Name']}"
+        records.append({
+            'key': f"{alert['Source']}:{alert['Rule']}:{participant}",
+            'source': alert['Source'],
+            'email': alert['Email'],
+            'name': alert['Name'],
+            'role': alert['Role'],
+            'cohort': int(alert['Cohort']) if alert['Cohort'] is not None else None,
+            'rule': alert['Rule'],
+            'severity': str(alert['Severity']),
+            'alert': alert['Alert'],
+            'reason': alert['Reason'],
+            'action': alert['Action'],
+        })
+    return records
+
+
+def current_alerts(data_dir=DATA_DIR):
+    """Every alert that holds on the data as it is now, as JSON-ready records"""
+    facts = build_engagement_facts(read_table('all_participants', data_dir),
+                                   read_table('enhanced_engagement', data_dir),
+                                   participant_rollups(update_session_rollups(data_dir)))
+    scorecard = _with_emails(read_table('engagement', data_dir), facts)
+    # As plain objects: scorecard alerts have no cohort, engagement alerts a nullable integer one
+    alerts = pd.concat([
+        evaluate_rules(facts[facts['Engagement_Status'].notna()], ENGAGEMENT_RULES).assign(Source='engagement').astype(object),
+        evaluate_rules(scorecard, SCORECARD_RULES).assign(Source='scorecard').astype(object),
+    ], ignore_index=True)
+    return alert_records(alerts)
+
+
+def load_snapshot(data_dir=DATA_DIR):
+    """Alerts active at the end of the previous scan, by key"""
+    try:
+        with open(_snapshot_path(data_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def rekey_snapshot(previous, current):
+    """previous with alerts from snapshots keyed Source:Rule:Name moved to the current keys
+
+    Snapshots written before alerts were keyed by participant have no 'source' field. Each
+    such alert takes the key of the one current alert with the same source, rule and name,
+    so the first scan after the change does not report every alert as resolved and new.
+    """
+    by_name = {}
+    for key, alert in current.items():
+        by_name.setdefault(f"{alert['source']}:{alert['rule']}:{alert['name']}", []).append(key)
+    rekeyed = {}
+    for key, alert in previous.items():
+        matches = by_name.get(key, []) if 'source' not in alert else []
+        rekeyed[matches[0] if len(matches) == 1 else key] = alert
+    return rekeyed
+
+
+def diff_alerts(previous, current):
+    """Events for alerts that appeared, changed or disappeared since the previous scan"""
+    events = []
+    for key, alert in current.items():
+        before = previous.get(key)
+        if before is None:
+            events.append(dict(alert, event='new'))
+        elif any(before.get(f) != alert.get(f) for f in TRACKED_FIELDS):
+            events.append(dict(alert, event='changed'))
+    for key, alert in previous.items():
+        if key not in current:
+            events.append(dict(alert, event='resolved'))
+    return events
+
+
+def scan(data_dir=DATA_DIR, now=None):
+    """Run one scan; returns the new, changed and resolved alerts since the previous one"""
+    now = (now or datetime.now()).isoformat(timespec='seconds')
+    current = {alert['key']: alert for alert in current_alerts(data_dir)}
+    previous = rekey_snapshot(load_snapshot(data_dir), current)
+    events = [dict(event, time=now) for event in diff_alerts(previous, current)]
+
+    if events:
+        append_events([{'type': 'Alert', 'message': f"{e['alert']} for {e['name']}", 'name': e['name'],
+                        'severity': e['severity']} for e in events if e['event'] != 'resolved'], data_dir)
+
+    path = _snapshot_path(data_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(current, f)
+    os.replace(path + '.tmp', path)
+    return events
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scan for mentorship alerts and goal completions and log changes since the last scan")
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    goal_events = collect_goal_events(read_table('goals', args.data_dir), args.data_dir)
+    print(f"{len(goal_events)} goal completions logged")
+    events = scan(args.data_dir)
+    counts = pd.Series([e['event'] for e in events], dtype=object).value_counts()
+    print(f"{len(events)} alert changes since the last scan: "
+          f"{counts.get('new', 0)} new, {counts.get('changed', 0)} changed, {counts.get('resolved', 0)} resolved")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from typing import Callable
+import pandas as pd
+
+SEVERITIES = ['Critical', 'Warning']
+ALERT_COLUMNS = ['Name', 'Email', 'Role', 'Cohort', 'Rule', 'Severity', 'Alert', 'Reason', 'Action']
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """One alert condition, evaluated on a whole frame at once
+
+    condition(frame) returns a boolean Series; reason(matches) returns one explanation per matching row.
+    """
+    rule_id: str
+    severity: str
+    title: str
+    action: str
+    condition: Callable
+    reason: Callable
+
+
+def _column(frame, name):
+    """Column as a Series, all missing when the frame does not have it"""
+    return frame[name] if name in frame.columns else pd.Series(pd.NA, index=frame.index, dtype=object)
+
+
+def _text(values, decimals=None):
+    values = pd.to_numeric(values, errors='coerce')
+    return (values.round(decimals) if decimals is not None else values).astype(str)
+
+
+# Rules over the engagement fact table (HR dashboard and mentee detail)
+ENGAGEMENT_RULES = [
+    AlertRule('no_recent_session', 'Critical', 'No session in last 30 days', 'Immediate attention required',
+              lambda f: _column(f, 'Risk_Flag') == 'No session in 30 days',
+              lambda m: 'Risk flag: ' + m['Risk_Flag'].astype(str)),
+    AlertRule('goals_not_updated', 'Warning', 'Goals not updated', 'Goal progress needs review',
+              lambda f: _column(f, 'Risk_Flag') == 'Goals not updated',
+              lambda m: 'Risk flag: ' + m['Risk_Flag'].astype(str)),
+    AlertRule('low_engagement', 'Warning', 'Low engagement detected', 'Consider additional support',
+              lambda f: _column(f, 'Engagement_Status') == 'At Risk',
+              lambda m: 'Engagement status: ' + m['Engagement_Status'].astype(str)),
+    AlertRule('low_goal_progress', 'Warning', 'Low goal progress', 'Review and adjust goals',
+              lambda f: pd.to_numeric(_column(f, 'Goal_Progress'), errors='coerce') < 50,
+              lambda m: 'Goal progress: ' + _text(m['Goal_Progress'], 0) + '%'),
+    AlertRule('low_satisfaction', 'Warning', 'Low satisfaction score', 'Schedule feedback session',
+              lambda f: pd.to_numeric(_column(f, 'Mentee_Satisfaction'), errors='coerce') < 3.5,
+              lambda m: 'Mentee satisfaction: ' + _text(m['Mentee_Satisfaction'], 1)),
+]
+
+# Rules over the engagement scorecards (engagement insights)
+SCORECARD_RULES = [
+    AlertRule('red_flag', 'Critical', 'Critical - Immediate intervention required', 'Schedule 1-on-1 meeting within 24 hours',
+              lambda f: _column(f, 'Flag') == 'Red',
+              lambda m: 'Engagement score: ' + m['Engagement_Score'].astype(str) + ', No proactive communication'),
+    AlertRule('yellow_flag', 'Warning', 'Warning - Monitor closely', 'Send check-in message and resources',
+              lambda f: _column(f, 'Flag') == 'Yellow',
+              lambda m: 'Engagement score: ' + m['Engagement_Score'].astype(str) + ', Low activity'),
+]
+
+
+def evaluate_rules(frame, rules=ENGAGEMENT_RULES):
+    """Alerts frame with one row per (participant, triggered rule), most severe first
+
+    Each rule is a single vectorized expression over the whole frame, so the cost
+    grows with the number of rules, not with the number of participants.
+    """
+    found = []
+    for order, rule in enumerate(rules):
+        mask = rule.condition(frame).fillna(False).astype(bool)
+        if not mask.any():
+            continue
+        matches = frame[mask]
+        found.append(pd.DataFrame({
+            'Name': matches['Name'],
+            'Email': _column(matches, 'Email'),
+            'Role': _column(matches, 'Role'),
+            'Cohort': _column(matches, 'Cohort'),
+            'Rule': rule.rule_id,
+            'Severity': rule.severity,
+            'Alert': rule.title,
+            'Reason': rule.reason(matches),
+            'Action': rule.action,
+            '_order': order,
+        }))
+
+    if not found:
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+    alerts = pd.concat(found, ignore_index=True)
+    alerts['Severity'] = pd.Categorical(alerts['Severity'], categories=SEVERITIES, ordered=True)
+    return alerts.sort_values(['Severity', '_order'], kind='stable').drop(columns='_order').reset_index(drop=True)
@@ -0,0 +1,79 @@
+import os
+import numpy as np
+import pandas as pd
+from modules.data_cache import DATA_DIR
+
+COHORTS_FILE = 'cohorts.csv'
+COHORT_COUNT = 4
+COHORT_COLUMNS = ['Participant_ID', 'Role', 'Cohort']
+
+
+def cohorts_path(data_dir=DATA_DIR):
+    return os.path.join(data_dir, COHORTS_FILE)
+
+
+def load_cohorts(data_dir=DATA_DIR):
+    """Persisted cohort membership, or an empty table when none was saved yet"""
+    try:
+        return pd.read_csv(cohorts_path(data_dir), dtype={'Participant_ID': 'string', 'Role': 'string'})
+    except (OSError, pd.errors.ParserError, pd.errors.EmptyDataError):
+        return pd.DataFrame({'Participant_ID': pd.Series(dtype='string'), 'Role': pd.Series(dtype='string'),
+                             'Cohort': pd.Series(dtype=int)})
+
+
+def save_cohorts(cohorts, data_dir=DATA_DIR):
+    """Write cohort membership next to the other data files so every worker reuses it"""
+    path = cohorts_path(data_dir)
+    try:
+        cohorts[COHORT_COLUMNS].to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
+
+
+def source_cohorts(participants, engagement):
+    """Cohort recorded in enhanced_engagement, per Participant_ID and Role
+
+    The engagement records carry only a name and role, so a record is attached to the
+    participant with the same name and role - but only where that is unambiguous, as
+    in the engagement facts. Cohorts outside 1..COHORT_COUNT are ignored.
+    """
+    keys = ['Name', 'Role']
+    records = engagement.rename(columns={'Participant_Name': 'Name'})[keys + ['Cohort']]
+    records = records.astype({'Name': 'string', 'Role': 'string'}).drop_duplicates(keys, keep=False)
+    records = records.assign(Cohort=pd.to_numeric(records['Cohort'], errors='coerce'))
+    records = records[records['Cohort'].isin(range(1, COHORT_COUNT + 1))]
+    directory = participants[['Participant_ID'] + keys].astype('string').drop_duplicates(keys, keep=False)
+    return directory.merge(records, on=keys, how='inner')[COHORT_COLUMNS]
+
+
+def assign_cohorts(participants, existing, source):
+    """Cohort per participant: the source cohort where the engagement data records one,
+    else the existing one, while everyone else is spread round-robin over the cohorts of
+    their role, smallest cohort first"""
+    keys = pd.DataFrame({'Participant_ID': participants['Participant_ID'].astype('string'),
+                         'Role': participants['Role'].astype('string')})
+    cohorts = keys.merge(existing[COHORT_COLUMNS].astype({'Participant_ID': 'string', 'Role': 'string'}),
+                         on=['Participant_ID', 'Role'], how='left', validate='one_to_one')
+    recorded = keys.merge(source, on=['Participant_ID', 'Role'], how='left', validate='one_to_one')['Cohort']
+    cohorts['Cohort'] = recorded.fillna(cohorts['Cohort'])
+
+    for role, new in cohorts[cohorts['Cohort'].isna()].groupby('Role'):
+        sizes = cohorts.loc[cohorts['Role'] == role, 'Cohort'].value_counts()
+        sizes = sizes.reindex(range(1, COHORT_COUNT + 1), fill_value=0)
+        order = sizes.sort_values(kind='stable').index.to_numpy()
+        cohorts.loc[new.index, 'Cohort'] = order[np.arange(len(new)) % COHORT_COUNT]
+
+    cohorts['Cohort'] = cohorts['Cohort'].astype(int)
+    return cohorts
+
+
+def add_cohorts(participants, engagement, data_dir=DATA_DIR):
+    """Participants with their Cohort column; assignments that changed are saved once"""
+    existing = load_cohorts(data_dir)
+    cohorts = assign_cohorts(participants, existing, source_cohorts(participants, engagement))
+    unchanged = cohorts.merge(existing[COHORT_COLUMNS], how='left', indicator=True)['_merge'] == 'both'
+    if len(cohorts) != len(existing) or not unchanged.all():
+        save_cohorts(cohorts, data_dir)
+    return participants.assign(Cohort=pd.Categorical(cohorts['Cohort'].to_numpy(),
+                                                     categories=range(1, COHORT_COUNT + 1)))
@@ -0,0 +1,131 @@
+import os
+import zlib
+from collections.abc import Mapping
+import pandas as pd
+
+# Directory holding the CSVs; MENTORSHIP_DATA_DIR points the app at another copy (e.g. benchmark data)
+DATA_DIR = os.environ.get('MENTORSHIP_DATA_DIR', "data")
+CACHE_DIR = ".cache"
+
+# Table name -> CSV file inside the data directory
+TABLES = {
+    'mentors': 'mentors.csv',
+    'pairings': 'pairings.csv',
+    'goals': 'goals.csv',
+    'engagement': 'engagement.csv',
+    'resources': 'resources.csv',
+    'participation': 'participation.csv',
+    'leadership_profiles': 'leadership_profiles.csv',
+    'all_participants': 'all_participants.csv',
+    'enhanced_engagement': 'enhanced_engagement.csv',
+    'session_notes': 'session_notes.csv',
+    'mentees_real_data': 'mentees_real_data.csv',
+    'mentors_real_data': 'mentors_real_data.csv',
+}
+
+# Extra pd.read_csv arguments per table, used to skip columns no page reads
+READ_OPTIONS = {
+    # Rows carry a trailing comma; without index_col=False the names become the index
+    'enhanced_engagement': {'index_col': False},
+    'mentees_real_data': {
+        'usecols': ['Name ', 'ID', 'Department ', 'Postion ', 'Email ', 'Nationality ',
+                    'Starting Years of services', 'Location '],
+    },
+}
+
+
+def table_path(name, data_dir=DATA_DIR):
+    """Path of the CSV file backing a table"""
+    return os.path.join(data_dir, TABLES[name])
+
+
+def table_signature(name, data_dir=DATA_DIR):
+    """(mtime, size) of a table's CSV file, used as its cache key"""
+    stat = os.stat(table_path(name, data_dir))
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _cache_file(name, signature, data_dir, ext):
+    mtime, size = signature
+    # Changing a table's read options must not serve frames parsed with the old ones
+    options = zlib.crc32(repr(READ_OPTIONS.get(name)).encode())
+    return os.path.join(data_dir, CACHE_DIR, f"{name}-{mtime}-{size}-{options:08x}.{ext}")
+
+
+def _read_cached(name, signature, data_dir):
+    """Return the cached frame for this signature, or None if there is none"""
+    for ext, reader in (('parquet', pd.read_parquet), ('pkl', pd.read_pickle)):
+        path = _cache_file(name, signature, data_dir, ext)
+        if os.path.exists(path):
+            try:
+                return reader(path)
+            except Exception:
+                return None
+    return None
+
+
+def _write_cached(name, signature, data_dir, df):
+    """Store df as a columnar file and drop entries for older versions of the CSV"""
+    cache_dir = os.path.join(data_dir, CACHE_DIR)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for entry in os.listdir(cache_dir):
+            if entry.startswith(f"{name}-"):
+                os.remove(os.path.join(cache_dir, entry))
+
+        # Parquet needs pyarrow and uniformly typed columns; pickle handles the rest
+        try:
+            path = _cache_file(name, signature, data_dir, 'parquet')
+            df.to_parquet(path + '.tmp')
+        except Exception:
+            if os.path.exists(path + '.tmp'):
+                os.remove(path + '.tmp')
+            path = _cache_file(name, signature, data_dir, 'pkl')
+            df.to_pickle(path + '.tmp')
+        os.replace(path + '.tmp', path)
+    except OSError:
+        # Read-only data directory - keep serving straight from the CSV
+        pass
+
+
+def read_table(name, data_dir=DATA_DIR):
+    """Read a table from its columnar cache, re-parsing the CSV when it has changed"""
+    signature = table_signature(name, data_dir)
+
+    df = _read_cached(name, signature, data_dir)
+    if df is None:
+        df = pd.read_csv(table_path(name, data_dir), **READ_OPTIONS.get(name, {}))
+        _write_cached(name, signature, data_dir, df)
+
+    return df
+
+
+class LazyData(Mapping):
+    """Read-only mapping of table name -> DataFrame that loads each table on first access"""
+
+    def __init__(self, loader, data_dir=DATA_DIR):
+        # loader(name, signature) -> DataFrame; the signature lets callers cache per table version
+        self._loader = loader
+        self._data_dir = data_dir
+        self._tables = {}
+
+    def __getitem__(self, name):
+        if name not in self._tables:
+            if name not in TABLES:
+                raise KeyError(name)
+            # The loader's frame is shared by every session; pages get a copy-on-write view of it
+            self._tables[name] = self._loader(name, table_signature(name, self._data_dir)).copy(deep=False)
+        return self._tables[name]
+
+    def __contains__(self, name):
+        return name in TABLES
+
+    def __iter__(self):
+        return iter(TABLES)
+
+    def __len__(self):
+        return len(TABLES)
+
+    def signature(self, *names):
+        """Version key for the given tables, for caching values derived from them"""
+        return tuple((name,) + table_signature(name, self._data_dir) for name in names)
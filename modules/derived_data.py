@@ -0,0 +1,299 @@
+import pandas as pd
+import streamlit as st
+from datetime import date
+from functools import wraps
+from modules.participants import build_participants
+from modules.cohorts import add_cohorts
+from modules.hr_metrics import build_metrics_cube, metrics_from_cube, window_months
+from modules.engagement_facts import build_engagement_facts, build_session_months
+from modules.matching import SOURCE_TABLES as ASSIGNMENT_TABLES, assign_mentors, load_assignments, save_assignments
+from modules.session_rollups import update_session_rollups, pairing_rollups, participant_months, participant_rollups
+from modules.search_index import SEARCH_FIELDS, SearchIndex
+from modules.figure_cache import FigureCache, figure_key
+from modules.exports import iter_export
+from modules.alerts import ENGAGEMENT_RULES, SCORECARD_RULES, evaluate_rules
+from modules.olap_cube import Cube
+from modules.profiler import Profiler, profile_log_path, profile_mode
+from modules.prefetch import Prefetcher
+
+# Tables derived from the raw CSVs, cached once per data version and shared by all pages.
+# The underscored data argument is not hashed by Streamlit; the signature is the cache key.
+# Frames live in st.cache_resource, so every session shares one object instead of unpickling
+# its own copy; getters hand out copy-on-write views so a page cannot modify the shared frame.
+
+
+def _view(frame):
+    return frame.copy(deep=False)
+
+
+# Tables the canonical participants table is built from (the rosters and the recorded cohorts)
+PARTICIPANT_TABLES = ('mentors_real_data', 'mentees_real_data', 'enhanced_engagement')
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _participants(_data, signature):
+    return add_cohorts(build_participants(_data['mentors_real_data'], _data['mentees_real_data']),
+                       _data['enhanced_engagement'])
+
+
+def get_participants(data):
+    """Canonical participants table (one row per mentor/mentee, with its persisted cohort)"""
+    return _view(_participants(data, data.signature(*PARTICIPANT_TABLES)))
+
+
+ENGAGEMENT_TABLES = ('all_participants', 'enhanced_engagement', 'session_notes')
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _session_rollups(signature):
+    # Reads only the session notes appended since the persisted watermark
+    return update_session_rollups()
+
+
+def get_session_rollups(data):
+    """Persisted session-notes rollup state for the current log"""
+    return _session_rollups(data.signature('session_notes'))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _pairing_sessions(_data, signature, as_of):
+    return pairing_rollups(get_session_rollups(_data), as_of)
+
+
+def get_pairing_sessions(data):
+    """Sessions, recency and cadence per mentor-mentee pair"""
+    return _view(_pairing_sessions(data, data.signature('session_notes'), date.today()))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _participant_sessions(_data, signature, as_of):
+    return participant_rollups(get_session_rollups(_data), as_of)
+
+
+def get_participant_sessions(data):
+    """Sessions, recency and cadence per participant"""
+    return _view(_participant_sessions(data, data.signature('session_notes'), date.today()))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _engagement_facts(_data, signature, as_of):
+    return build_engagement_facts(_data['all_participants'], _data['enhanced_engagement'], get_participant_sessions(_data))
+
+
+def get_engagement_facts(data):
+    """Engagement fact table (one typed row per participant)"""
+    return _view(_engagement_facts(data, data.signature(*ENGAGEMENT_TABLES), date.today()))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _metrics_cube(_data, signature, as_of):
+    facts = get_engagement_facts(_data)
+    return build_metrics_cube(facts, build_session_months(facts, participant_months(get_session_rollups(_data))))
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _hr_metrics(_data, signature, timeframe, cohort, as_of):
+    # Sums the pre-aggregated cube cells for this timeframe and cohort
+    cube = _metrics_cube(_data, signature, as_of)
+    return metrics_from_cube(cube, get_engagement_facts(_data), window_months(timeframe, as_of), cohort)
+
+
+def get_hr_metrics(data, timeframe, cohort=None):
+    """HR dashboard metrics, memoized per (data version, timeframe, cohort)"""
+    return _hr_metrics(data, data.signature(*ENGAGEMENT_TABLES), timeframe, cohort, date.today())
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _assignments(_data, signature):
+    # Reuse the persisted assignment unless one of its inputs changed since it was written
+    assignments = load_assignments()
+    if assignments is None:
+        assignments = assign_mentors(get_participants(_data))
+        save_assignments(assignments)
+    return assignments
+
+
+def get_assignments(data):
+    """Optimal mentor-mentee assignment, shared by every session and persisted to data/assignments.csv"""
+    return _view(_assignments(data, data.signature(*ASSIGNMENT_TABLES)))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _search_index(_data, signature):
+    # One index object shared across sessions; it is read-only after construction
+    return SearchIndex(get_participants(_data))
+
+
+def get_search_index(data):
+    """Search index over the participants table of the current data version"""
+    return _search_index(data, data.signature(*PARTICIPANT_TABLES))
+
+
+def search_participants(data, query, role=None):
+    """Participants matching query (name, email or ID), best matches first"""
+    participants = get_participants(data)
+    matches = participants.iloc[get_search_index(data).search(query)]
+    if role is not None:
+        matches = matches[matches['Role'] == role]
+    return matches
+
+
+@st.cache_resource(show_spinner=False)
+def _figure_cache():
+    # One LRU per process, shared by every session
+    return FigureCache()
+
+
+def cached_figure(chart_id, version, build, **params):
+    """Plotly figure for (chart, data version, filter values), rebuilt only when one of them changes"""
+    return _figure_cache().get_or_build(figure_key(chart_id, version, **params), build)
+
+
+@st.cache_resource(show_spinner=False)
+def get_profiler():
+    """Section profiler shared by every session of this process"""
+    return Profiler(profile_mode(), profile_log_path())
+
+
+def span(name):
+    """Profile the enclosed block as one section of the current rerun"""
+    return get_profiler().span(name)
+
+
+def profiled_fragment(name, **options):
+    """st.fragment(**options) timed as section `name`; a rerun of only the fragment is
+    logged as a run of its own"""
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = get_profiler()
+            with profiler.run(name), profiler.span(name):
+                return function(*args, **kwargs)
+        return st.fragment(wrapper, **options)
+    return decorate
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _export(_frame, export_id, version, filters, fmt):
+    return b''.join(iter_export(_frame, fmt))
+
+
+def get_export(frame, export_id, version, fmt, **filters):
+    """Export file bytes, built on first request and reused per (filter state, data version, format)"""
+    return _export(frame, export_id, version, tuple(sorted(filters.items())), fmt)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _engagement_alerts(_data, signature, as_of):
+    facts = get_engagement_facts(_data)
+    # Roster rows without an engagement record have nothing to alert on
+    return evaluate_rules(facts[facts['Engagement_Status'].notna()], ENGAGEMENT_RULES)
+
+
+def get_engagement_alerts(data):
+    """Alerts for every participant with an engagement record, from one vectorized pass"""
+    return _view(_engagement_alerts(data, data.signature(*ENGAGEMENT_TABLES), date.today()))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _scorecard_alerts(_data, signature):
+    return evaluate_rules(_data['engagement'], SCORECARD_RULES)
+
+
+def get_scorecard_alerts(data):
+    """Red/yellow flag alerts over the engagement scorecards"""
+    return _view(_scorecard_alerts(data, data.signature('engagement')))
+
+
+# Aggregation cubes for page charts: name -> (dimensions, summed measures)
+CUBES = {
+    'participants': (['Cohort', 'Location', 'Role', 'Department'], []),
+    'pairings': (['Cohort', 'Status'], ['Progress_Score', 'Sessions_Completed', 'Total_Sessions']),
+    'goals': (['Cohort', 'Status'], []),
+}
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _cube(_data, name, signature):
+    dimensions, measures = CUBES[name]
+    frame = get_participants(_data) if name == 'participants' else _data[name]
+    return Cube(frame, dimensions, measures)
+
+
+def get_cube(data, name):
+    """Pre-aggregated counts and sums of a table, built once per data version"""
+    tables = PARTICIPANT_TABLES if name == 'participants' else (name,)
+    return _cube(data, name, data.signature(*tables))
+
+
+def select_rows(data, name, equals=None, contains=None):
+    """Rows of a table matching every {column: value} filter (None = no filter) and, with
+    contains=(columns, text), containing text in any of those columns.
+
+    Filters are pushed down to the database when the storage backend supports queries.
+    """
+    if getattr(data, 'supports_queries', False):
+        return data.select(name, equals, contains)
+
+    frame = data[name]
+    mask = pd.Series(True, index=frame.index)
+    for column, value in (equals or {}).items():
+        if value is not None:
+            mask &= frame[column] == value
+    if contains and contains[1]:
+        mask &= pd.concat([frame[c].astype(str).str.contains(contains[1], case=False, regex=False)
+                           for c in contains[0]], axis=1).any(axis=1)
+    return frame[mask]
+
+
+def filter_participants(data, role=None, location=None, search=None, cohort=None):
+    """Participants directory filtered by role, location, cohort and search text
+
+    On the SQLite backend every filter is pushed down to the database, search text as a
+    LIKE on name, email and ID in table order. The CSV backend filters in pandas and
+    searches through the ranked index, best matches first and with fuzzy matches.
+    """
+    if getattr(data, 'supports_queries', False):
+        return data.select('participants', {'Role': role, 'Location': location, 'Cohort': cohort},
+                           contains=(SEARCH_FIELDS, search))
+    participants = search_participants(data, search) if search else get_participants(data)
+    for column, value in (('Role', role), ('Location', location), ('Cohort', cohort)):
+        if value is not None:
+            participants = participants[participants[column] == value]
+    return participants
+
+
+# Derived tables each page reads when it first renders, by page key (see modules.router).
+# Only bounded, table-sized work: the mentor assignment solve is left to the page itself.
+PAGE_DATA = {
+    'hr_dashboard': {
+        'hr metrics': lambda data: get_hr_metrics(data, 'All Time'),
+        'engagement alerts': get_engagement_alerts,
+    },
+    'mentor_eligibility': {
+        'participants': get_participants,
+        'participants cube': lambda data: get_cube(data, 'participants'),
+        'search index': get_search_index,
+    },
+    'progress_tracker': {
+        'participants': get_participants,
+        'engagement facts': get_engagement_facts,
+        'participant sessions': get_participant_sessions,
+        'pairing sessions': get_pairing_sessions,
+    },
+}
+
+
+@st.cache_resource(show_spinner=False)
+def get_prefetcher():
+    """Prefetch pool shared by every session of this process"""
+    return Prefetcher()
+
+
+def prefetch_pages(pages, open_data):
+    """Compute the derived tables of pages in the background, each on a data mapping from
+    open_data() taken when it starts; returns the queued futures"""
+    tasks = {}
+    for page in pages:
+        tasks.update(PAGE_DATA.get(page, {}))
+    return get_prefetcher().schedule(tasks, open_data)
@@ -0,0 +1,68 @@
+import pandas as pd
+
+NUMERIC_COLUMNS = ['Cohort', 'Total_Sessions', 'Sessions_This_Month', 'Mentor_Satisfaction',
+                   'Mentee_Satisfaction', 'Goal_Progress']
+CATEGORICAL_COLUMNS = ['Role', 'Engagement_Status', 'Location', 'Grade']
+
+
+# Session rollup columns as they appear in the fact table
+SESSION_COLUMNS = {
+    'Sessions': 'Logged_Sessions',
+    'Last_Session': 'Last_Logged_Session',
+    'Avg_Duration': 'Avg_Session_Minutes',
+    'Monthly_Cadence': 'Logged_Sessions_Per_Month',
+    'Sessions_This_Month': 'Logged_Sessions_This_Month',
+    'Days_Since_Last_Session': 'Days_Since_Last_Session',
+}
+
+
+def _email_keys(records, all_participants, keys):
+    """records with the Email of the participant they belong to
+
+    enhanced_engagement and the session notes carry no ID or email, only a name (and role),
+    so a record is keyed to the participant with the same name and role - but only where
+    that is unambiguous. Names shared by several participants, and repeated records, stay
+    unmatched instead of raising or being attached to the wrong person.
+    """
+    directory = all_participants[keys + ['Email']].drop_duplicates(keys, keep=False)
+    records = records.drop_duplicates(keys, keep=False).merge(directory, on=keys, how='inner')
+    return records.drop(columns=keys).drop_duplicates('Email', keep=False)
+
+
+def build_session_months(facts, participant_months):
+    """Logged sessions per participant and calendar month, with the participant's Cohort and Role
+
+    Sessions are attached by name like the session rollups of the fact table: only where
+    the name identifies one participant.
+    """
+    directory = facts[['Name', 'Cohort', 'Role']].drop_duplicates('Name', keep=False)
+    return participant_months.merge(directory, on='Name', how='inner')[['Month', 'Cohort', 'Role', 'Sessions']]
+
+
+def build_engagement_facts(all_participants, enhanced_engagement, session_rollups):
+    """One typed row per participant: profile, engagement record and logged session rollup
+
+    Participants are keyed by Email. Values a participant has no record for stay missing
+    (NaN, or NA for the nullable Cohort), so they are left out of any mean.
+    """
+    all_participants = all_participants.assign(Email=all_participants['Email'].astype('string').str.strip().str.lower())
+    engagement = _email_keys(enhanced_engagement.rename(columns={'Participant_Name': 'Name'}),
+                             all_participants, ['Name', 'Role'])
+    sessions = _email_keys(session_rollups[['Name'] + list(SESSION_COLUMNS)].rename(columns=SESSION_COLUMNS),
+                           all_participants, ['Name'])
+
+    facts = all_participants.merge(engagement, on='Email', how='left', validate='many_to_one')
+    facts = facts.merge(sessions, on='Email', how='left', validate='many_to_one')
+
+    # Fix dtypes once here so pages never coerce
+    for column in NUMERIC_COLUMNS:
+        facts[column] = pd.to_numeric(facts[column], errors='coerce')
+    facts['Cohort'] = facts['Cohort'].astype('Int64')
+    for column in ['Logged_Sessions', 'Logged_Sessions_This_Month']:
+        facts[column] = pd.to_numeric(facts[column]).fillna(0).astype(int)
+    facts['Last_Session_Date'] = pd.to_datetime(facts['Last_Session_Date'], errors='coerce')
+    facts['Risk_Flag'] = facts['Risk_Flag'].fillna('')
+    for column in CATEGORICAL_COLUMNS:
+        facts[column] = facts[column].astype('category')
+
+    return facts
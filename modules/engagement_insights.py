@@ -3,6 +3,9 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from modules.alerts import SCORECARD_RULES
+from modules.derived_data import get_scorecard_alerts, select_rows
+from modules.table_view import cell_styles
 
 def show_engagement_insights(data):
     """Module 4: AI-Powered Engagement Insights"""
@@ -45,17 +48,13 @@ def show_engagement_insights(data):
     with col3:
         search_name = st.text_input("Search by Name:", placeholder="Enter name...")
     
-    # Apply filters
-    filtered_engagement = data['engagement'].copy()
-    
-    if role_filter != "All":
-        filtered_engagement = filtered_engagement[filtered_engagement['Role'] == role_filter]
-    
-    if flag_filter != "All":
-        filtered_engagement = filtered_engagement[filtered_engagement['Flag'] == flag_filter]
-    
-    if search_name:
-        filtered_engagement = filtered_engagement[filtered_engagement['Name'].str.contains(search_name, case=False, na=False)]
+    # Apply filters (pushed down to the database when the SQLite backend is active)
+    filtered_engagement = select_rows(
+        data, 'engagement',
+        equals={'Role': role_filter if role_filter != "All" else None,
+                'Flag': flag_filter if flag_filter != "All" else None},
+        contains=(['Name'], search_name),
+    )
     
     # Simple Engagement Overview
     st.subheader("📊 Engagement Overview")
@@ -96,7 +95,7 @@ def show_engagement_insights(data):
         else:
             return 'background-color: #6B7280; color: white'
     
-    display_df = filtered_engagement[['Name', 'Role', 'Engagement_Score', 'Flag', 'Proactive_Communication', 'EQ_Score', 'Sessions_Attended', 'Response_Rate']].copy()
+    display_df = filtered_engagement[['Name', 'Role', 'Engagement_Score', 'Flag', 'Proactive_Communication', 'EQ_Score', 'Sessions_Attended', 'Response_Rate']]
     
     styled_df = display_df.style.applymap(style_flags, subset=['Flag']).applymap(style_communication, subset=['Proactive_Communication'])
     
@@ -106,38 +105,21 @@ def show_engagement_insights(data):
     st.markdown("---")
     st.subheader("🚨 Alert Logic & Recommendations")
     
-    # Calculate alerts based on criteria
-    alerts = []
-    for _, row in filtered_engagement.iterrows():
-        if row['Flag'] == 'Red':
-            alerts.append({
-                'Name': row['Name'],
-                'Alert': 'Critical - Immediate intervention required',
-                'Reason': f"Engagement score: {row['Engagement_Score']}, No proactive communication",
-                'Action': 'Schedule 1-on-1 meeting within 24 hours'
-            })
-        elif row['Flag'] == 'Yellow':
-            alerts.append({
-                'Name': row['Name'],
-                'Alert': 'Warning - Monitor closely',
-                'Reason': f"Engagement score: {row['Engagement_Score']}, Low activity",
-                'Action': 'Send check-in message and resources'
-            })
-    
-    if alerts:
-        alert_df = pd.DataFrame(alerts)
-        
-        def style_alert_level(val):
-            if 'Critical' in val:
-                return 'background-color: #FEE2E2; color: #DC2626'
-            else:
-                return 'background-color: #FEF3C7; color: #D97706'
-        
-        styled_alerts = alert_df.style.applymap(style_alert_level, subset=['Alert'])
+    # Alerts from the shared rule set, restricted to the filtered participants
+    alerts = get_scorecard_alerts(data)
+    alerts = alerts[alerts['Name'].isin(filtered_engagement['Name'])]
+    
+    if len(alerts) > 0:
+        alert_df = alerts[['Name', 'Alert', 'Reason', 'Action']]
+        alert_styles = {'Alert': {rule.title: ('background-color: #FEE2E2; color: #DC2626' if rule.severity == 'Critical'
+                                               else 'background-color: #FEF3C7; color: #D97706')
+                                  for rule in SCORECARD_RULES}}
+        styled_alerts = alert_df.style.apply(cell_styles, column_styles=alert_styles, axis=None)
         st.dataframe(styled_alerts, use_container_width=True)
         
         # Alert information display only (no action buttons)
-        st.info(f"📋 Total alerts: {len(alerts)} | Critical: {len([a for a in alerts if 'Critical' in a['Alert']])} | Warnings: {len([a for a in alerts if 'Warning' in a['Alert']])}")
+        severity_counts = alerts['Severity'].value_counts()
+        st.info(f"📋 Total alerts: {len(alerts)} | Critical: {severity_counts.get('Critical', 0)} | Warnings: {severity_counts.get('Warning', 0)}")
     else:
         st.success("🎉 No active alerts! All participants are showing good engagement.")
     
@@ -0,0 +1,175 @@
+"""Append-only program event log (goal completions, session notes, resource uploads, alerts)
+
+Events are JSON lines in data/events.jsonl. A fixed-width side index in the cache
+directory maps each event's timestamp to its byte offset, so the latest N events
+or a time range are found with a binary search instead of a scan, and readers can
+tail the log from a byte cursor without rereading history.
+"""
+import json
+import os
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from modules.data_cache import CACHE_DIR, DATA_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows - single writer assumed
+    fcntl = None
+
+EVENT_LOG = 'events.jsonl'
+INDEX_FILE = 'events.idx'
+SOURCES_STATE = 'event_sources.json'
+# One index record per event: nanosecond timestamp and byte offset of its line
+INDEX_DTYPE = np.dtype([('time', '<i8'), ('offset', '<i8')])
+
+
+def event_log_path(data_dir=DATA_DIR):
+    return os.path.join(data_dir, EVENT_LOG)
+
+
+def _index_path(data_dir):
+    return os.path.join(data_dir, CACHE_DIR, INDEX_FILE)
+
+
+def _read_index(data_dir):
+    """Memory-mapped index; only the pages a search touches are read"""
+    path = _index_path(data_dir)
+    try:
+        if os.path.getsize(path) >= INDEX_DTYPE.itemsize:
+            return np.memmap(path, dtype=INDEX_DTYPE, mode='r')
+    except OSError:
+        pass
+    return np.empty(0, dtype=INDEX_DTYPE)
+
+
+def _rebuild_index(data_dir):
+    """Recreate the index from the log, e.g. after the cache directory was cleared"""
+    records = []
+    try:
+        with open(event_log_path(data_dir), 'rb') as f:
+            offset = 0
+            for line in f:
+                if line.endswith(b'\n'):
+                    records.append((json.loads(line)['ts'], offset))
+                offset += len(line)
+    except OSError:
+        pass
+    path = _index_path(data_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.array(records, dtype=INDEX_DTYPE).tofile(path + '.tmp')
+    os.replace(path + '.tmp', path)
+
+
+def append_events(events, data_dir=DATA_DIR):
+    """Append events ({'type': ..., 'message': ..., ...}) stamped with the current time"""
+    if not events:
+        return
+    path = event_log_path(data_dir)
+    os.makedirs(os.path.join(data_dir, CACHE_DIR), exist_ok=True)
+    if os.path.exists(path) and not os.path.exists(_index_path(data_dir)):
+        _rebuild_index(data_dir)
+
+    with open(path, 'ab') as log:
+        if fcntl:
+            fcntl.flock(log, fcntl.LOCK_EX)
+        try:
+            index = _read_index(data_dir)
+            # Timestamps never go backwards, so the index stays sorted
+            ts = max(time.time_ns(), int(index['time'][-1]) + 1 if len(index) else 0)
+            offset = log.seek(0, os.SEEK_END)
+            lines, records = [], []
+            for i, event in enumerate(events):
+                stamp = ts + i
+                line = json.dumps(dict(event, ts=stamp, time=datetime.fromtimestamp(stamp / 1e9).isoformat(timespec='seconds')))
+                line = (line + '\n').encode()
+                lines.append(line)
+                records.append((stamp, offset))
+                offset += len(line)
+            log.write(b''.join(lines))
+            log.flush()
+            with open(_index_path(data_dir), 'ab') as idx:
+                idx.write(np.array(records, dtype=INDEX_DTYPE).tobytes())
+        finally:
+            if fcntl:
+                fcntl.flock(log, fcntl.LOCK_UN)
+
+
+def _read_lines(data_dir, start, end=None):
+    """Complete event lines between two byte offsets; returns (events, offset after the last one)"""
+    try:
+        with open(event_log_path(data_dir), 'rb') as f:
+            f.seek(start)
+            chunk = f.read() if end is None else f.read(end - start)
+    except OSError:
+        return [], start
+    chunk = chunk[:chunk.rfind(b'\n') + 1]
+    return [json.loads(line) for line in chunk.splitlines() if line], start + len(chunk)
+
+
+def latest_events(limit=5, data_dir=DATA_DIR):
+    """The newest events, newest first, and a cursor to tail from"""
+    index = _read_index(data_dir)
+    start = int(index['offset'][-limit]) if len(index) >= limit else 0
+    events, cursor = _read_lines(data_dir, start)
+    return events[::-1][:limit], cursor
+
+
+def events_since(cursor, data_dir=DATA_DIR):
+    """Events appended after cursor (oldest first) and the new cursor"""
+    return _read_lines(data_dir, cursor)
+
+
+def events_between(start, end=None, data_dir=DATA_DIR):
+    """Events whose time falls in [start, end), found by binary search on the index"""
+    index = _read_index(data_dir)
+    times = index['time']
+    first = np.searchsorted(times, pd.Timestamp(start).value, side='left')
+    last = np.searchsorted(times, pd.Timestamp(end).value, side='left') if end is not None else len(index)
+    if first >= last:
+        return []
+    stop = int(index['offset'][last]) if last < len(index) else None
+    return _read_lines(data_dir, int(index['offset'][first]), stop)[0]
+
+
+def _load_sources_state(data_dir):
+    try:
+        with open(os.path.join(data_dir, CACHE_DIR, SOURCES_STATE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_sources_state(state, data_dir):
+    path = os.path.join(data_dir, CACHE_DIR, SOURCES_STATE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(state, f)
+    os.replace(path + '.tmp', path)
+
+
+def goal_completion_events(goals, seen):
+    """Events for goals marked Completed that were not completed at the last check"""
+    completed = goals[goals['Status'] == 'Completed']
+    keys = completed['Mentee'].astype(str) + '|' + completed['SMART_Goal'].astype(str)
+    new = completed[~keys.isin(seen)]
+    events = [{'type': 'Goal', 'message': f"Mentee {goal['Mentee']} completed a goal: {goal['SMART_Goal']}",
+               'name': goal['Mentee']} for _, goal in new.iterrows()]
+    return events, sorted(keys)
+
+
+def session_note_events(rows):
+    """Events for newly logged session notes"""
+    return [{'type': 'Session', 'message': f"Mentor {row['Mentor_Name']} uploaded session notes with {row['Mentee_Name']}",
+             'name': row['Mentor_Name']} for _, row in rows.iterrows()]
+
+
+def collect_goal_events(goals, data_dir=DATA_DIR):
+    """Log goal completions that appeared in goals.csv since the last collection"""
+    state = _load_sources_state(data_dir)
+    events, seen = goal_completion_events(goals, set(state.get('completed_goals', [])))
+    append_events(events, data_dir)
+    state['completed_goals'] = seen
+    _save_sources_state(state, data_dir)
+    return events
@@ -0,0 +1,62 @@
+import importlib.util
+import io
+import zlib
+
+CHUNK_ROWS = 10_000
+
+# Label -> (file extension, MIME type, optional dependency)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv', None),
+    'CSV (gzip)': ('csv.gz', 'application/gzip', None),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'openpyxl'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet', 'pyarrow'),
+}
+
+
+def available_formats():
+    """Export formats whose optional writer is installed"""
+    return [label for label, (_, _, module) in EXPORT_FORMATS.items()
+            if module is None or importlib.util.find_spec(module) is not None]
+
+
+def iter_csv(frame, chunk_rows=CHUNK_ROWS):
+    """Encoded CSV, one chunk of rows at a time, so the whole file never exists as one string"""
+    yield frame.iloc[:0].to_csv(index=False).encode()
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows].to_csv(index=False, header=False).encode()
+
+
+def iter_gzip(chunks):
+    """Gzip-compress a stream of byte chunks"""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_export(frame, fmt, chunk_rows=CHUNK_ROWS):
+    """Export frame in the given format as a stream of byte chunks"""
+    if fmt == 'CSV':
+        yield from iter_csv(frame, chunk_rows)
+    elif fmt == 'CSV (gzip)':
+        yield from iter_gzip(iter_csv(frame, chunk_rows))
+    elif fmt in ('Excel', 'Parquet'):
+        # Binary container formats are written in one pass by their library
+        buffer = io.BytesIO()
+        if fmt == 'Excel':
+            frame.to_excel(buffer, index=False)
+        else:
+            frame.to_parquet(buffer, index=False)
+        yield buffer.getvalue()
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_file_name(stem, fmt):
+    return f"{stem}.{EXPORT_FORMATS[fmt][0]}"
+
+
+def export_mime(fmt):
+    return EXPORT_FORMATS[fmt][1]
@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+
+# Estimated serialized size budget for all cached figures together
+MAX_BYTES = 32 * 1024 * 1024
+MAX_ENTRIES = 256
+# Trace properties holding the data arrays, which make up nearly all of a figure's size
+ARRAY_PROPERTIES = ('x', 'y', 'z', 'values', 'labels', 'parents', 'text', 'customdata', 'ids', 'lat', 'lon', 'r', 'theta')
+# Estimated JSON bytes per array value, and for a figure's layout and trace settings
+BYTES_PER_VALUE = 16
+BASE_BYTES = 8 * 1024
+
+
+def figure_key(chart_id, version, **params):
+    """Cache key for a chart: its id, the data version it was built from and its filter values"""
+    return (chart_id, version, tuple(sorted(params.items())))
+
+
+def estimate_size(figure):
+    """Approximate serialized size of a figure from the lengths of its data arrays, without serializing it"""
+    values = 0
+    for trace in figure.data:
+        for name in ARRAY_PROPERTIES:
+            value = trace[name] if name in trace else None
+            if value is not None and not isinstance(value, str) and hasattr(value, '__len__'):
+                values += len(value)
+    return BASE_BYTES + values * BYTES_PER_VALUE
+
+
+class FigureCache:
+    """Thread-safe LRU of built Plotly figures, capped by entry count and estimated JSON size
+
+    A figure's size is estimated from its data arrays when stored (see estimate_size).
+    Cached figures are shared between reruns and sessions and must not be modified.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, max_entries=MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (figure, estimated json_bytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, figure):
+        spec_size = estimate_size(figure)
+        if spec_size > self.max_bytes:
+            return figure
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (figure, spec_size)
+            self.size += spec_size
+            while self.size > self.max_bytes or len(self._entries) > self.max_entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+        return figure
+
+    def get_or_build(self, key, build):
+        """Cached figure for key, calling build() only on a miss"""
+        figure = self.get(key)
+        if figure is None:
+            figure = self.put(key, build())
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
@@ -0,0 +1,186 @@
+from dataclasses import dataclass, field
+import pandas as pd
+
+PROGRESS_BINS = [0, 25, 50, 75, 100]
+PROGRESS_LABELS = ['0-25%', '26-50%', '51-75%', '76-100%']
+
+
+@dataclass
+class HRMetrics:
+    """Every number shown on the HR dashboard for one filter combination"""
+    # Program Overview
+    mentors_count: int = 0
+    mentees_count: int = 0
+    total_participants: int = 0
+    completion_rate: float = 0
+    # Engagement
+    engagement_rate: float = 0
+    avg_mentor_sessions: float = 0
+    avg_mentee_sessions: float = 0
+    total_sessions: int = 0
+    # Satisfaction & Progress
+    mentor_satisfaction: float = 0
+    mentee_satisfaction: float = 0
+    goal_progress_rate: float = 0
+    # Risks & Dropouts
+    dropped_mentors: int = 0
+    dropped_mentees: int = 0
+    dropped_mentor_rate: float = 0
+    dropped_mentee_rate: float = 0
+    no_session_30_days: int = 0
+    low_coverage_mentors: int = 0
+    # Chart inputs and risk details
+    status_counts: pd.Series = field(default_factory=lambda: pd.Series(dtype=int))
+    progress_counts: pd.Series = field(default_factory=lambda: pd.Series(0, index=PROGRESS_LABELS))
+    at_risk: pd.DataFrame = field(default_factory=pd.DataFrame)
+    dropped: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+
+def _rate(part, whole):
+    return round(part / whole * 100, 1) if whole > 0 else 0
+
+
+def _mean(total, count):
+    return round(total / count, 1) if count > 0 else 0
+
+
+# Dimensions of the pre-aggregated cube; a participant's month is the month of their last session,
+# while logged sessions are bucketed by the month they took place in
+CUBE_KEYS = ['Month', 'Cohort', 'Role', 'Engagement_Status', 'Risk_Flag', 'Progress_Bin']
+# Timeframe selector option -> number of calendar months it covers (None = everything)
+TIMEFRAME_MONTHS = {'All Time': None, 'This Month': 1, 'Last 3 Months': 3}
+
+
+def window_months(timeframe, as_of):
+    """Calendar months covered by a timeframe ending in the month of as_of, or None for all time"""
+    count = TIMEFRAME_MONTHS[timeframe]
+    if count is None:
+        return None
+    return list(pd.period_range(end=pd.Period(as_of, 'M'), periods=count, freq='M'))
+
+
+def build_metrics_cube(engagement, session_months=None):
+    """Additive partial aggregates per (month, cohort, role, status, risk flag, progress bin)
+
+    Any timeframe x cohort combination is answered by summing the matching cells, so
+    changing a filter never rescans the participant rows. session_months (Month, Cohort,
+    Role, Sessions per participant and month) adds cells that only carry Logged_Sessions.
+    """
+    progress = engagement['Goal_Progress']
+    rows = pd.DataFrame({
+        'Month': pd.to_datetime(engagement['Last_Session_Date']).dt.to_period('M'),
+        'Cohort': engagement['Cohort'] if 'Cohort' in engagement.columns else pd.NA,
+        'Role': engagement['Role'],
+        'Engagement_Status': engagement['Engagement_Status'],
+        'Risk_Flag': engagement['Risk_Flag'] if 'Risk_Flag' in engagement.columns else pd.NA,
+        'Progress_Bin': pd.cut(progress, bins=PROGRESS_BINS, labels=PROGRESS_LABELS),
+        'Total_Sessions': engagement['Total_Sessions'],
+        'Mentor_Satisfaction': engagement['Mentor_Satisfaction'],
+        'Mentee_Satisfaction': engagement['Mentee_Satisfaction'],
+        'Goal_Progress': progress,
+        'Completed': progress >= 90,
+        'Has_Progress': progress > 0,
+        'Logged_Sessions': 0,
+    })
+
+    # One pass over the rows; everything else works on the resulting cells.
+    # Sums skip missing values, so each one keeps its own non-null count as the mean's denominator.
+    cube = rows.groupby(CUBE_KEYS, dropna=False, observed=True).agg(
+        Count=('Total_Sessions', 'size'),
+        Sessions=('Total_Sessions', 'sum'),
+        Sessions_Count=('Total_Sessions', 'count'),
+        Mentor_Satisfaction=('Mentor_Satisfaction', 'sum'),
+        Mentor_Satisfaction_Count=('Mentor_Satisfaction', 'count'),
+        Mentee_Satisfaction=('Mentee_Satisfaction', 'sum'),
+        Mentee_Satisfaction_Count=('Mentee_Satisfaction', 'count'),
+        Progress_Count=('Goal_Progress', 'count'),
+        Completed=('Completed', 'sum'),
+        Has_Progress=('Has_Progress', 'sum'),
+        Logged_Sessions=('Logged_Sessions', 'sum'),
+    ).reset_index()
+    if session_months is None or session_months.empty:
+        return cube
+
+    sessions = session_months.groupby(['Month', 'Cohort', 'Role'], dropna=False, observed=True)['Sessions'].sum()
+    sessions = sessions.rename('Logged_Sessions').reset_index()
+    measures = [c for c in cube.columns if c not in CUBE_KEYS]
+    sessions = sessions.reindex(columns=cube.columns).fillna({m: 0 for m in measures})
+    return pd.concat([cube, sessions.astype(cube.dtypes.to_dict())], ignore_index=True)
+
+
+def _in_scope(months, cohorts, window, cohort):
+    mask = pd.Series(True, index=months.index)
+    if window is not None:
+        mask &= months.isin(window)
+    if cohort is not None:
+        mask &= (cohorts == cohort).fillna(False).astype(bool)
+    return mask
+
+
+def metrics_from_cube(cube, engagement, months=None, cohort=None):
+    """Dashboard metrics for the given months (None = all time) and cohort (None = all cohorts)"""
+    metrics = HRMetrics()
+    cells = cube[_in_scope(cube['Month'], cube['Cohort'], months, cohort)]
+    if cells.empty:
+        return metrics
+
+    by_role = cells.groupby('Role', observed=True)[['Count', 'Sessions', 'Sessions_Count', 'Logged_Sessions',
+                                                     'Mentor_Satisfaction', 'Mentor_Satisfaction_Count']].sum()
+    mentors = by_role.loc['Mentor'] if 'Mentor' in by_role.index else pd.Series(0, index=by_role.columns)
+    mentees = by_role.loc['Mentee'] if 'Mentee' in by_role.index else pd.Series(0, index=by_role.columns)
+    status_counts = cells.groupby('Engagement_Status', observed=True)['Count'].sum().sort_values(ascending=False)
+    risk_counts = cells.groupby('Risk_Flag', observed=True)['Count'].sum()
+    dropped = cells[cells['Engagement_Status'] == 'Dropped'].groupby('Role', observed=True)['Count'].sum()
+
+    total = int(cells['Count'].sum())
+    metrics.mentors_count = int(mentors['Count'])
+    metrics.mentees_count = int(mentees['Count'])
+    metrics.total_participants = total
+    progress_count = cells['Progress_Count'].sum()
+    metrics.completion_rate = _rate(cells['Completed'].sum(), progress_count)
+
+    metrics.engagement_rate = _rate(status_counts.get('Active', 0), total)
+    if months is None:
+        metrics.avg_mentor_sessions = _mean(mentors['Sessions'], mentors['Sessions_Count'])
+        metrics.avg_mentee_sessions = _mean(mentees['Sessions'], mentees['Sessions_Count'])
+        metrics.total_sessions = int(cells['Sessions'].sum())
+    else:
+        # Recorded totals span a participant's whole history; a window counts only the
+        # sessions logged in its months, averaged over the participants in scope
+        metrics.avg_mentor_sessions = _mean(mentors['Logged_Sessions'], mentors['Count'])
+        metrics.avg_mentee_sessions = _mean(mentees['Logged_Sessions'], mentees['Count'])
+        metrics.total_sessions = int(cells['Logged_Sessions'].sum())
+
+    metrics.mentor_satisfaction = _mean(mentors['Mentor_Satisfaction'], mentors['Mentor_Satisfaction_Count'])
+    metrics.mentee_satisfaction = _mean(cells['Mentee_Satisfaction'].sum(), cells['Mentee_Satisfaction_Count'].sum())
+    metrics.goal_progress_rate = _rate(cells['Has_Progress'].sum(), progress_count)
+
+    metrics.dropped_mentors = int(dropped.get('Mentor', 0))
+    metrics.dropped_mentees = int(dropped.get('Mentee', 0))
+    metrics.dropped_mentor_rate = _rate(metrics.dropped_mentors, metrics.mentors_count)
+    metrics.dropped_mentee_rate = _rate(metrics.dropped_mentees, metrics.mentees_count)
+    metrics.no_session_30_days = int(risk_counts.get('No session in 30 days', 0))
+    metrics.low_coverage_mentors = int(risk_counts.get('Low coverage', 0))
+
+    metrics.status_counts = status_counts
+    progress_counts = cells.groupby('Progress_Bin', observed=True)['Count'].sum()
+    metrics.progress_counts = progress_counts.reindex(PROGRESS_LABELS, fill_value=0).sort_values(ascending=False, kind='stable')
+
+    # Only the flagged participants are listed individually
+    status = engagement['Engagement_Status']
+    flagged = engagement[status.isin(['At Risk', 'Dropped'])]
+    flagged = flagged[_in_scope(pd.to_datetime(flagged['Last_Session_Date']).dt.to_period('M'),
+                                flagged['Cohort'] if 'Cohort' in flagged.columns else pd.Series(pd.NA, index=flagged.index),
+                                months, cohort)]
+    detail_columns = [c for c in ['Name', 'Role', 'Risk_Flag', 'Dropout_Reason'] if c in engagement.columns]
+    metrics.at_risk = flagged.loc[flagged['Engagement_Status'] == 'At Risk', detail_columns]
+    metrics.dropped = flagged.loc[flagged['Engagement_Status'] == 'Dropped', detail_columns]
+
+    return metrics
+
+
+def compute_hr_metrics(engagement):
+    """Compute all-time dashboard metrics for the given engagement rows"""
+    if engagement.empty:
+        return HRMetrics()
+    return metrics_from_cube(build_metrics_cube(engagement), engagement)
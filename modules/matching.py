@@ -0,0 +1,100 @@
+import math
+import os
+import numpy as np
+import pandas as pd
+from modules.data_cache import DATA_DIR, table_path
+
+ASSIGNMENTS_FILE = 'assignments.csv'
+# Inputs whose changes make a persisted assignment stale
+SOURCE_TABLES = ('mentors_real_data', 'mentees_real_data')
+
+ASSIGNMENT_COLUMNS = ['Mentor_ID', 'Mentor_Name', 'Mentee_ID', 'Mentee_Name', 'Same_Location']
+
+
+def _codes(left, right):
+    """Integer codes for two categorical columns over a shared vocabulary (-1 = missing)"""
+    codes, _ = pd.factorize(pd.concat([left.astype('string'), right.astype('string')], ignore_index=True))
+    return codes[:len(left)], codes[len(left):]
+
+
+def _free_slots(load, capacity):
+    """Mentor of every unused slot, least loaded mentors first (rank, then mentor order)"""
+    free = np.maximum(capacity - load, 0)
+    slot_mentor = np.repeat(np.arange(len(load)), free)
+    starts = np.repeat(np.cumsum(free) - free, free)
+    slot_rank = np.arange(len(slot_mentor)) - starts + np.repeat(load, free)
+    return slot_mentor[np.lexsort((slot_mentor, slot_rank))]
+
+
+def assign_mentors(participants, capacity=None):
+    """Mentor-mentee assignment with the most same-location pairs under per-mentor capacity
+
+    The roster exports only share Location between mentors and mentees, so that is the
+    one compatibility criterion. Locations are independent: each one fills its own
+    mentors' slots round-robin, and mentees left over (no local mentor, or local slots
+    full) go to the least loaded mentors anywhere. This is optimal for the criterion and
+    runs in O(participants) memory. By default every mentor gets the same capacity, just
+    enough for every mentee to be matched.
+    """
+    # Stable input order so the same data always yields the same assignment
+    participants = participants.sort_values(['Role', 'Participant_ID'], kind='stable')
+    mentors = participants[participants['Role'] == 'Mentor'].reset_index(drop=True)
+    mentees = participants[participants['Role'] == 'Mentee'].reset_index(drop=True)
+    if mentors.empty or mentees.empty:
+        return pd.DataFrame(columns=ASSIGNMENT_COLUMNS)
+
+    capacity = capacity or math.ceil(len(mentees) / len(mentors))
+    mentee_loc, mentor_loc = _codes(mentees['Location'], mentors['Location'])
+    mentor_of = np.full(len(mentees), -1)
+    load = np.zeros(len(mentors), dtype=int)
+
+    for location in np.unique(mentee_loc[mentee_loc >= 0]):
+        local_mentors = np.flatnonzero(mentor_loc == location)
+        if len(local_mentors) == 0:
+            continue
+        local_mentees = np.flatnonzero(mentee_loc == location)[:capacity * len(local_mentors)]
+        mentor_of[local_mentees] = local_mentors[np.arange(len(local_mentees)) % len(local_mentors)]
+        load += np.bincount(mentor_of[local_mentees], minlength=len(mentors))
+
+    leftover = np.flatnonzero(mentor_of < 0)
+    slots = _free_slots(load, capacity)[:len(leftover)]
+    # With an explicit capacity too small for everyone, the last mentees stay unassigned
+    mentor_of[leftover[:len(slots)]] = slots
+
+    mentee_idx = np.flatnonzero(mentor_of >= 0)
+    mentor_idx = mentor_of[mentee_idx]
+    return pd.DataFrame({
+        'Mentor_ID': mentors['Participant_ID'].to_numpy()[mentor_idx],
+        'Mentor_Name': mentors['Name'].to_numpy()[mentor_idx],
+        'Mentee_ID': mentees['Participant_ID'].to_numpy()[mentee_idx],
+        'Mentee_Name': mentees['Name'].to_numpy()[mentee_idx],
+        'Same_Location': (mentee_loc[mentee_idx] >= 0) & (mentee_loc[mentee_idx] == mentor_loc[mentor_idx]),
+    }).sort_values(['Mentor_Name', 'Mentee_Name'], ignore_index=True)
+
+
+def assignments_path(data_dir=DATA_DIR):
+    return os.path.join(data_dir, ASSIGNMENTS_FILE)
+
+
+def load_assignments(data_dir=DATA_DIR):
+    """Persisted assignment, or None when missing, older than any of its inputs or
+    written with other columns (by an earlier version of the engine)"""
+    path = assignments_path(data_dir)
+    try:
+        saved = os.stat(path).st_mtime_ns
+        if any(os.stat(table_path(name, data_dir)).st_mtime_ns > saved for name in SOURCE_TABLES):
+            return None
+        assignments = pd.read_csv(path, dtype={'Mentor_ID': 'string', 'Mentee_ID': 'string'})
+    except (OSError, pd.errors.ParserError, pd.errors.EmptyDataError):
+        return None
+    return assignments if list(assignments.columns) == ASSIGNMENT_COLUMNS else None
+
+
+def save_assignments(assignments, data_dir=DATA_DIR):
+    """Write the assignment next to the other data files so every worker reuses it"""
+    path = assignments_path(data_dir)
+    try:
+        assignments.to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from modules.derived_data import get_export
+from modules.exports import available_formats, export_file_name, export_mime
 
 def show_mentor_community(data):
     """Module 6: Mentor Participation & Community"""
@@ -35,8 +37,8 @@ def show_mentor_community(data):
     with col1:
         st.subheader("📊 Mentor Retention by Year")
         # Create retention data
-        retention_data = data['participation'].copy()
-        retention_data['Years_Count'] = retention_data['Years'].str.count(',') + 1
+        retention_data = data['participation']
+        retention_data = retention_data.assign(Years_Count=retention_data['Years'].str.count(',') + 1)
         
         fig_retention = px.histogram(
             retention_data,
@@ -72,7 +74,7 @@ def show_mentor_community(data):
     st.subheader("⭐ Mentor Spotlight")
     
     # Featured mentors
-    featured = data['participation'][data['participation']['Featured_in_Newsletter'] == 'Yes'].copy()
+    featured = data['participation'][data['participation']['Featured_in_Newsletter'] == 'Yes']
     
     if not featured.empty:
         for _, mentor in featured.iterrows():
@@ -109,7 +111,7 @@ def show_mentor_community(data):
         else:
             return 'background-color: #6B7280; color: white'
     
-    display_df = data['participation'][['Name', 'Cohorts_Participated', 'Returning_Mentor', 'Featured_in_Newsletter', 'Total_Mentees', 'Success_Rate']].copy()
+    display_df = data['participation'][['Name', 'Cohorts_Participated', 'Returning_Mentor', 'Featured_in_Newsletter', 'Total_Mentees', 'Success_Rate']]
     
     styled_df = display_df.style.applymap(style_returning, subset=['Returning_Mentor']).applymap(style_featured, subset=['Featured_in_Newsletter'])
     
@@ -173,12 +175,13 @@ def show_mentor_community(data):
     
     with col2:
         st.write("**Export Report:**")
-        csv = data['participation'].to_csv(index=False)
+        export_format = st.selectbox("Format:", available_formats(), key="participation_export_format")
+        participation, version = data['participation'], data.signature('participation')
         st.download_button(
-            label="Download CSV",
-            data=csv,
-            file_name="mentor_participation_report.csv",
-            mime="text/csv"
+            label=f"Download {export_format}",
+            data=lambda: get_export(participation, 'mentor_participation_report', version, export_format),
+            file_name=export_file_name("mentor_participation_report", export_format),
+            mime=export_mime(export_format)
         )
     
     with col3:
@@ -1,42 +1,27 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from modules.cohorts import COHORT_COUNT
+from modules.derived_data import (PARTICIPANT_TABLES, cached_figure, filter_participants, get_cube, get_export,
+                                  get_participants, profiled_fragment)
+from modules.exports import available_formats, export_file_name, export_mime
+from modules.table_view import cell_styles, show_paginated_table
+
+MENTOR_LIST_COLUMNS = ['Name', 'Email', 'Location', 'Eligible_Mentor']
+MENTEE_LIST_COLUMNS = ['Name', 'Email', 'Grade', 'Location']
+
 
 def show_mentor_eligibility(data):
     """All Participants Directory - Mentors and Mentees with Details"""
     st.title("All Participants Directory")
     st.markdown("### Complete List of Mentors and Mentees")
     
-    # Get participant data from real data files
-    mentors_real = data['mentors_real_data'].copy()
-    mentees_real = data['mentees_real_data'].copy()
-    
-    # Clean column names
-    mentors_real.columns = mentors_real.columns.str.strip()
-    mentees_real.columns = mentees_real.columns.str.strip()
-    
-    # Create combined participants data from real data
-    mentors_df = pd.DataFrame({
-        'Name': mentors_real['Mentors from LDP'],
-        'Email': mentors_real['Email'],
-        'Grade': 'Senior',  # Mock grade
-        'Location': mentors_real['Location'],
-        'Role': 'Mentor',
-        'Eligible_Mentor': 'Yes'
-    })
-    
-    mentees_df = pd.DataFrame({
-        'Name': mentees_real['Name'],
-        'Email': mentees_real['Email'],
-        'Grade': mentees_real['Postion'],
-        'Location': mentees_real['Location'],
-        'Role': 'Mentee'
-    })
-    
-    # Combine mentors and mentees
-    participants = pd.concat([mentors_df, mentees_df], ignore_index=True)
-    mentors = mentors_df
-    mentees = mentees_df
+    # Canonical participants table, normalized once per data version
+    participants = get_participants(data)
+    # Data version for the chart cache
+    version = data.signature(*PARTICIPANT_TABLES)
+    mentors = participants[participants['Role'] == 'Mentor']
+    mentees = participants[participants['Role'] == 'Mentee']
     
     # Analytics Cards
     col1, col2, col3, col4 = st.columns(4)
@@ -55,64 +40,7 @@ def show_mentor_eligibility(data):
     
     st.markdown("---")
     
-    # Search and Filter
-    col1, col2, col3 = st.columns([2, 1, 1])
-    
-    with col1:
-        search_term = st.text_input("Search participants by name:", placeholder="Enter participant name...")
-    
-    with col2:
-        role_filter = st.selectbox("Filter by role:", ["All Participants", "Mentors Only", "Mentees Only"])
-    
-    with col3:
-        location_filter = st.selectbox("Filter by location:", ["All Locations"] + list(participants['Location'].unique()))
-    
-    # Filter data
-    filtered_data = participants.copy()
-    
-    if search_term:
-        filtered_data = filtered_data[filtered_data['Name'].str.contains(search_term, case=False, na=False)]
-    
-    if role_filter == "Mentors Only":
-        filtered_data = filtered_data[filtered_data['Role'] == 'Mentor']
-    elif role_filter == "Mentees Only":
-        filtered_data = filtered_data[filtered_data['Role'] == 'Mentee']
-    
-    if location_filter != "All Locations":
-        filtered_data = filtered_data[filtered_data['Location'] == location_filter]
-    
-    # Display comprehensive participant lists
-    st.subheader("All Participants List")
-    
-    # Display participant details with Name, Email, Grade, Location
-    display_columns = ['Name', 'Email', 'Grade', 'Location', 'Role']
-    
-    # Add eligibility status for mentors
-    if 'Eligible_Mentor' in filtered_data.columns:
-        display_columns.append('Eligible_Mentor')
-    
-    display_df = filtered_data[display_columns].copy()
-    
-    # Style the dataframe for role and eligibility
-    def style_role(val):
-        if val == 'Mentor':
-            return 'background-color: #ff6b35; color: white; font-weight: bold'
-        elif val == 'Mentee':
-            return 'background-color: #fed7aa; color: #2d3748; font-weight: bold'
-        return ''
-    
-    def style_eligibility(val):
-        if val == 'Yes':
-            return 'background-color: #10B981; color: white'
-        elif val == 'No':
-            return 'background-color: #EF4444; color: white'
-        return ''
-    
-    styled_df = display_df.style.applymap(style_role, subset=['Role'])
-    if 'Eligible_Mentor' in display_df.columns:
-        styled_df = styled_df.applymap(style_eligibility, subset=['Eligible_Mentor'])
-    
-    st.dataframe(styled_df, use_container_width=True)
+    show_directory(data)
     
     # Separate Mentor and Mentee Lists
     st.markdown("---")
@@ -121,7 +49,7 @@ def show_mentor_eligibility(data):
     
     with col1:
         st.subheader("Mentors List")
-        mentor_list = mentors[['Name', 'Email', 'Grade', 'Location', 'Eligible_Mentor']]
+        mentor_list = mentors[MENTOR_LIST_COLUMNS]
         if len(mentor_list) > 0:
             st.dataframe(mentor_list, use_container_width=True)
         else:
@@ -129,119 +57,198 @@ def show_mentor_eligibility(data):
     
     with col2:
         st.subheader("Mentees List")
-        mentee_list = mentees[['Name', 'Email', 'Grade', 'Location']]
+        mentee_list = mentees[MENTEE_LIST_COLUMNS]
         if len(mentee_list) > 0:
             st.dataframe(mentee_list, use_container_width=True)
         else:
             st.info("No mentees found.")
     
-    # Export functionality
+    # Location Distribution
     st.markdown("---")
-    col1, col2, col3 = st.columns([1, 1, 1])
+    st.subheader("Participants by Location")
+    show_location_chart(data, version)
+    
+    # Role Distribution - Centered across all columns as requested
+    st.subheader("Role Distribution")
+    participant_cube = get_cube(data, 'participants')
+    def build_role_chart():
+        role_counts = participant_cube.counts('Role')
+        fig_role = px.bar(
+            x=role_counts.index,
+            y=role_counts.values,
+            title="Mentors vs Mentees",
+            color=role_counts.values,
+            color_continuous_scale=['#fed7aa', '#ff6b35']
+        )
+        fig_role.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font_color='#2d3748',
+            xaxis_title="Role",
+            yaxis_title="Number of Participants"
+        )
+        return fig_role
+
+    fig_role = cached_figure('participants_by_role', version, build_role_chart)
+    st.plotly_chart(fig_role, use_container_width=True)
+    
+    # Removed Mentor Eligibility pie chart as requested
+
+
+def directory_filters(data):
+    """Directory rows for the current search and filter widgets, and the filter values"""
+    search_term = st.session_state.get("directory_search", "")
+    role_filter = st.session_state.get("directory_role", "All Participants")
+    location_filter = st.session_state.get("directory_location", "All Locations")
+    cohort_filter = st.session_state.get("directory_cohort", "All Cohorts")
+    # Filters and search are pushed down to the database on the SQLite backend
+    filtered_data = filter_participants(
+        data,
+        role={"Mentors Only": "Mentor", "Mentees Only": "Mentee"}.get(role_filter),
+        location=location_filter if location_filter != "All Locations" else None,
+        search=search_term,
+        cohort=int(cohort_filter.split()[-1]) if cohort_filter != "All Cohorts" else None,
+    )
+    return filtered_data, {'search': search_term, 'role': role_filter, 'location': location_filter,
+                           'cohort': cohort_filter}
+
+
+@profiled_fragment("Directory: participants")
+def show_directory(data):
+    """Search, filters and the participants table - filtering reruns only this fragment"""
+    participants = get_participants(data)
+    
+    # Search and Filter
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
     
     with col1:
-        if st.button("Export All Participants", type="primary"):
-            csv = filtered_data.to_csv(index=False)
-            st.download_button(
-                label="Download All Participants CSV",
-                data=csv,
-                file_name="all_participants.csv",
-                mime="text/csv"
-            )
+        st.text_input("Search participants by name:", placeholder="Enter participant name, email or ID...", key="directory_search")
     
     with col2:
-        if st.button("Export Mentors Only"):
-            mentors_csv = mentor_list.to_csv(index=False)
-            st.download_button(
-                label="Download Mentors CSV",
-                data=mentors_csv,
-                file_name="mentors_list.csv",
-                mime="text/csv"
-            )
+        st.selectbox("Filter by role:", ["All Participants", "Mentors Only", "Mentees Only"], key="directory_role")
     
     with col3:
-        if st.button("Export Mentees Only"):
-            mentees_csv = mentee_list.to_csv(index=False)
-            st.download_button(
-                label="Download Mentees CSV",
-                data=mentees_csv,
-                file_name="mentees_list.csv",
-                mime="text/csv"
-            )
+        st.selectbox("Filter by location:", ["All Locations"] + list(participants['Location'].dropna().unique()), key="directory_location")
     
-    # Location Distribution
+    with col4:
+        st.selectbox("Filter by cohort:", ["All Cohorts"] + [f"Cohort {i}" for i in range(1, COHORT_COUNT + 1)], key="directory_cohort")
+    
+    filtered_data, filters = directory_filters(data)
+    
+    # Display comprehensive participant lists
+    st.subheader("All Participants List")
+    
+    # Display participant details with Name, Email, Grade, Location and mentor eligibility
+    display_columns = ['Name', 'Email', 'Grade', 'Location', 'Role', 'Eligible_Mentor']
+    
+    display_df = filtered_data[display_columns]
+    
+    # Style the dataframe for role and eligibility
+    column_styles = {
+        'Role': {
+            'Mentor': 'background-color: #ff6b35; color: white; font-weight: bold',
+            'Mentee': 'background-color: #fed7aa; color: #2d3748; font-weight: bold',
+        },
+        'Eligible_Mentor': {
+            'Yes': 'background-color: #10B981; color: white',
+            'No': 'background-color: #EF4444; color: white',
+        },
+    }
+    
+    # Paginated mode sorts and slices server-side and styles only the visible page
+    if st.toggle("Paginated view", value=True, key="directory_paginated"):
+        show_paginated_table(display_df, "directory", column_styles)
+    else:
+        st.dataframe(display_df.style.apply(cell_styles, column_styles=column_styles, axis=None), use_container_width=True)
+
+    # Rendered in this fragment so the buttons always export the current filter state
+    show_directory_exports(data, filtered_data, filters)
+
+
+def show_directory_exports(data, filtered_data, filters):
+    """Download buttons - a file is only built when its button is clicked, then reused per filter state"""
     st.markdown("---")
-    st.subheader("Participants by Location")
+    export_format = st.selectbox("Export format:", available_formats(), key="directory_export_format")
+    participants = get_participants(data)
+    mentor_list = participants.loc[participants['Role'] == 'Mentor', MENTOR_LIST_COLUMNS]
+    mentee_list = participants.loc[participants['Role'] == 'Mentee', MENTEE_LIST_COLUMNS]
+    version = data.signature(*PARTICIPANT_TABLES)
+    col1, col2, col3 = st.columns([1, 1, 1])
     
+    with col1:
+        st.download_button(
+            label=f"Export All Participants ({export_format})",
+            data=lambda: get_export(filtered_data, 'all_participants', version, export_format, **filters),
+            file_name=export_file_name("all_participants", export_format),
+            mime=export_mime(export_format),
+            type="primary"
+        )
+    
+    with col2:
+        st.download_button(
+            label=f"Export Mentors Only ({export_format})",
+            data=lambda: get_export(mentor_list, 'mentors_list', version, export_format),
+            file_name=export_file_name("mentors_list", export_format),
+            mime=export_mime(export_format)
+        )
+    
+    with col3:
+        st.download_button(
+            label=f"Export Mentees Only ({export_format})",
+            data=lambda: get_export(mentee_list, 'mentees_list', version, export_format),
+            file_name=export_file_name("mentees_list", export_format),
+            mime=export_mime(export_format)
+        )
+
+
+@profiled_fragment("Directory: location chart")
+def show_location_chart(data, version):
+    """Location pie with its own role and cohort filters - changing them reruns only the chart"""
     # Add filters for location graph
     col1, col2 = st.columns(2)
     with col1:
         location_role_filter = st.selectbox("Filter by role for location chart:", ["All Participants", "Mentors Only", "Mentees Only"], key="location_role")
     with col2:
-        cohort_filter = st.selectbox("Filter by cohort:", ["All Cohorts"] + [f"Cohort {i}" for i in range(1, 5)], key="location_cohort")
-    
-    # Filter data for location chart
-    location_filtered_data = participants.copy()
-    if location_role_filter == "Mentors Only":
-        location_filtered_data = location_filtered_data[location_filtered_data['Role'] == 'Mentor']
-    elif location_role_filter == "Mentees Only":
-        location_filtered_data = location_filtered_data[location_filtered_data['Role'] == 'Mentee']
-    
-    # Add cohort data if not exists (mock data)
-    if 'Cohort' not in location_filtered_data.columns:
-        import random
-        location_filtered_data['Cohort'] = [random.randint(1, 4) for _ in range(len(location_filtered_data))]
-    
-    if cohort_filter != "All Cohorts":
-        cohort_num = int(cohort_filter.split()[-1])
-        location_filtered_data = location_filtered_data[location_filtered_data['Cohort'] == cohort_num]
-    
-    location_counts = location_filtered_data['Location'].value_counts()
-    threshold = 0.03  # 3%
-
-    # Calculate percentage distribution
-    total = location_counts.sum()
-    location_percent = location_counts / total
-
-    # Filter to keep only values above threshold
-    filtered_locations = location_counts[location_percent >= threshold]
-
-    # Optional: group the small ones into "Other"
-    if (location_percent < threshold).any():
-        other_sum = location_counts[location_percent < threshold].sum()
-        filtered_locations['Other'] = other_sum
-
-    # Create pie chart
-    fig = px.pie(
-        values=filtered_locations.values,
-        names=filtered_locations.index,
-        title="Distribution of Participants by Location",
-        color_discrete_sequence=['#ff6b35', '#fed7aa', '#fff5f0', '#b3b3b3']  # Add more if needed
-    )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font_color='#2d3748'
-    )
-    st.plotly_chart(fig, use_container_width=True)
+        cohort_filter = st.selectbox("Filter by cohort:", ["All Cohorts"] + [f"Cohort {i}" for i in range(1, COHORT_COUNT + 1)], key="location_cohort")
     
-    # Role Distribution - Centered across all columns as requested
-    st.subheader("Role Distribution")
-    role_counts = participants['Role'].value_counts()
-    fig_role = px.bar(
-        x=role_counts.index,
-        y=role_counts.values,
-        title="Mentors vs Mentees",
-        color=role_counts.values,
-        color_continuous_scale=['#fed7aa', '#ff6b35']
-    )
-    fig_role.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font_color='#2d3748',
-        xaxis_title="Role",
-        yaxis_title="Number of Participants"
-    )
-    st.plotly_chart(fig_role, use_container_width=True)
-    
-    # Removed Mentor Eligibility pie chart as requested
+    # Location counts come from the participants cube, not from the raw rows
+    participant_cube = get_cube(data, 'participants')
+    location_role = {"Mentors Only": 'Mentor', "Mentees Only": 'Mentee'}.get(location_role_filter)
+    cohort_num = int(cohort_filter.split()[-1]) if cohort_filter != "All Cohorts" else None
+    location_totals = participant_cube.counts('Location', {'Role': location_role, 'Cohort': cohort_num})
+
+    def build_location_chart():
+        # Drop empty categories and use plain labels so small locations can be grouped into "Other"
+        location_counts = location_totals[location_totals > 0]
+        location_counts.index = location_counts.index.astype(str)
+        threshold = 0.03  # 3%
+
+        # Calculate percentage distribution
+        total = location_counts.sum()
+        location_percent = location_counts / total
+
+        # Filter to keep only values above threshold
+        filtered_locations = location_counts[location_percent >= threshold]
+
+        # Optional: group the small ones into "Other"
+        if (location_percent < threshold).any():
+            other_sum = location_counts[location_percent < threshold].sum()
+            filtered_locations['Other'] = other_sum
+
+        # Create pie chart
+        fig = px.pie(
+            values=filtered_locations.values,
+            names=filtered_locations.index,
+            title="Distribution of Participants by Location",
+            color_discrete_sequence=['#ff6b35', '#fed7aa', '#fff5f0', '#b3b3b3']  # Add more if needed
+        )
+        fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font_color='#2d3748'
+        )
+        return fig
+
+    fig = cached_figure('participants_by_location', version, build_location_chart,
+                        role=location_role_filter, cohort=cohort_filter)
+    st.plotly_chart(fig, use_container_width=True)
@@ -107,7 +107,7 @@ def show_my_goals(data, mentor_name):
         status_filter = st.selectbox("Filter by Status:", ["All", "Completed", "Active", "Not Started"])
     
     # Apply filters
-    filtered_goals = mentee_goals.copy()
+    filtered_goals = mentee_goals
     
     if len(mentee_names) > 1 and selected_mentee != "All":
         filtered_goals = filtered_goals[filtered_goals['Mentee'] == selected_mentee]
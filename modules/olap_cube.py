@@ -0,0 +1,54 @@
+import pandas as pd
+
+COUNT = 'Count'
+
+
+class Cube:
+    """Row counts and column sums of a table, pre-aggregated over a few dimension columns
+
+    Queries roll the stored cells up further, so their cost depends on the number of
+    distinct dimension combinations rather than on the number of rows.
+    """
+
+    def __init__(self, frame, dimensions, measures=()):
+        # Dimensions the table does not have are skipped
+        self.dimensions = [d for d in dimensions if d in frame.columns]
+        self.measures = list(measures)
+        if not self.dimensions:
+            raise ValueError("A cube needs at least one dimension column")
+        aggregations = {COUNT: (self.dimensions[0], 'size')}
+        aggregations.update({m: (m, 'sum') for m in self.measures})
+        self.cells = frame.groupby(self.dimensions, dropna=False, observed=True).agg(**aggregations).reset_index()
+
+    def members(self, dimension):
+        """Distinct values of one dimension, sorted"""
+        return sorted(self.cells[dimension].dropna().unique())
+
+    def _mask(self, where):
+        mask = pd.Series(True, index=self.cells.index)
+        for dimension, value in (where or {}).items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set, pd.Index)):
+                mask &= self.cells[dimension].isin(list(value))
+            else:
+                mask &= self.cells[dimension] == value
+        return mask
+
+    def query(self, by, where=None):
+        """Count and measure sums per value of the `by` dimension(s), over the rows matching
+        every where {dimension: value or list of values} filter (None = no filter)"""
+        by = [by] if isinstance(by, str) else list(by)
+        cells = self.cells[self._mask(where)]
+        return cells.groupby(by, observed=True)[[COUNT] + self.measures].sum()
+
+    def counts(self, by, where=None):
+        """Row counts per value of `by`, largest first - like value_counts() on the raw rows"""
+        return self.query(by, where)[COUNT].sort_values(ascending=False, kind='stable')
+
+    def means(self, by, where=None):
+        """Per-row means of every measure per value of `by`, with the row count"""
+        totals = self.query(by, where)
+        means = totals[self.measures].div(totals[COUNT], axis=0)
+        means[COUNT] = totals[COUNT]
+        return means
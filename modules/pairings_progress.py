@@ -3,6 +3,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from modules.my_mentee import show_my_mentee
+from modules.derived_data import cached_figure, get_cube, select_rows
 
 def show_pairings_progress(data):
     """Module 2: Mentor-Mentee Pairings & Progress Tracker"""
@@ -12,14 +13,14 @@ def show_pairings_progress(data):
     # Key Metrics
     col1, col2, col3, col4 = st.columns(4)
     
-    total_pairings = len(data['pairings'])
-    active_pairings = len(data['pairings'][data['pairings']['Status'] == 'Active'])
-    completed_pairings = len(data['pairings'][data['pairings']['Status'] == 'Completed'])
-    
-    # Calculate completion rate and progress score
-    data['pairings']['completion_rate'] = data['pairings']['Sessions_Completed'] / data['pairings']['Total_Sessions'] * 100
-    avg_completion = round(data['pairings']['completion_rate'].mean(), 1)
-    avg_progress = round(data['pairings']['Progress_Score'].mean(), 1)
+    # Headline numbers come from the pre-aggregated pairings cube; everything the filters
+    # below drive (the mentor roll-up included) is computed from the filtered rows
+    pairings_cube = get_cube(data, 'pairings')
+    status_totals = pairings_cube.query('Status')
+    total_pairings = int(status_totals['Count'].sum())
+    active_pairings = int(status_totals['Count'].get('Active', 0))
+    completed_pairings = int(status_totals['Count'].get('Completed', 0))
+    avg_progress = round(status_totals['Progress_Score'].sum() / total_pairings, 1) if total_pairings > 0 else 0
     
     with col1:
         st.metric("Total Pairings", total_pairings)
@@ -39,7 +40,7 @@ def show_pairings_progress(data):
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        cohort_filter = st.selectbox("Filter by Cohort:", ["All"] + list(data['pairings']['Cohort'].unique()))
+        cohort_filter = st.selectbox("Filter by Cohort:", ["All"] + pairings_cube.members('Cohort'))
     
     with col2:
         status_filter = st.selectbox("Filter by Status:", ["All", "Active", "Completed"])
@@ -47,17 +48,10 @@ def show_pairings_progress(data):
     with col3:
         search_mentor = st.text_input("Search Mentor:", placeholder="Enter mentor name...")
     
-    # Apply filters
-    filtered_pairings = data['pairings'].copy()
-    
-    if cohort_filter != "All":
-        filtered_pairings = filtered_pairings[filtered_pairings['Cohort'] == cohort_filter]
-    
-    if status_filter != "All":
-        filtered_pairings = filtered_pairings[filtered_pairings['Status'] == status_filter]
-    
-    if search_mentor:
-        filtered_pairings = filtered_pairings[filtered_pairings['Mentor'].str.contains(search_mentor, case=False, na=False)]
+    # Apply filters (pushed down to the database when the SQLite backend is active)
+    pairing_filters = {'Cohort': cohort_filter if cohort_filter != "All" else None,
+                       'Status': status_filter if status_filter != "All" else None}
+    filtered_pairings = select_rows(data, 'pairings', equals=pairing_filters, contains=(['Mentor'], search_mentor))
     
     # Progress Tracker Dashboard
     st.subheader("🎯 Progress Tracker Dashboard")
@@ -73,29 +67,34 @@ def show_pairings_progress(data):
     mentor_progress['Overall_Completion'] = (mentor_progress['Total_Sessions_Completed'] / mentor_progress['Total_Sessions_Planned'] * 100).round(1)
     
     # Simple progress visualization
-    fig_progress = px.bar(
-        mentor_progress,
-        x='Mentor',
-        y='Avg_Progress_Score',
-        title="Average Progress Score by Mentor",
-        color='Avg_Progress_Score',
-        color_continuous_scale="RdYlGn",
-        text='Mentee_Count'
-    )
-    fig_progress.update_layout(
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        xaxis_tickangle=-45,
-        showlegend=False
-    )
-    fig_progress.update_traces(texttemplate='%{text} mentees', textposition='outside')
+    def build_progress_chart():
+        fig_progress = px.bar(
+            mentor_progress,
+            x='Mentor',
+            y='Avg_Progress_Score',
+            title="Average Progress Score by Mentor",
+            color='Avg_Progress_Score',
+            color_continuous_scale="RdYlGn",
+            text='Mentee_Count'
+        )
+        fig_progress.update_layout(
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            xaxis_tickangle=-45,
+            showlegend=False
+        )
+        fig_progress.update_traces(texttemplate='%{text} mentees', textposition='outside')
+        return fig_progress
+
+    fig_progress = cached_figure('mentor_progress', data.signature('pairings'), build_progress_chart,
+                                 cohort=cohort_filter, status=status_filter, mentor=search_mentor)
     st.plotly_chart(fig_progress, use_container_width=True)
     
     # Progress Tracker Table
     st.subheader("📋 Progress Tracker")
     
     # Create enhanced display dataframe
-    display_df = filtered_pairings.copy()
+    display_df = filtered_pairings.copy(deep=False)  # copy-on-write: only the added columns take new memory
     display_df['Session_Progress'] = display_df.apply(
         lambda row: f"{row['Sessions_Completed']}/{row['Total_Sessions']}", 
         axis=1
@@ -111,7 +110,7 @@ def show_pairings_progress(data):
     st.markdown("---")
     st.subheader("View Mentor's Detailed Progress")
     
-    mentor_list = ["None"] + sorted(data['pairings']['Mentor'].unique().tolist())
+    mentor_list = ["None"] + sorted(data['pairings']['Mentor'].dropna().unique().tolist())
     selected_mentor_for_detail = st.selectbox("Select a mentor to see their mentee details:", mentor_list)
 
     if selected_mentor_for_detail != "None":
@@ -0,0 +1,74 @@
+import pandas as pd
+
+# Source columns each roster export must provide (after stripping whitespace)
+MENTOR_SOURCE_COLUMNS = ['Mentors from LDP', 'Email', 'Location', 'Nesma id']
+MENTEE_SOURCE_COLUMNS = ['Name', 'ID', 'Department', 'Postion', 'Email', 'Nationality',
+                         'Starting Years of services', 'Location']
+
+PARTICIPANT_COLUMNS = ['Participant_ID', 'Name', 'Email', 'Role', 'Grade', 'Department',
+                       'Location', 'Nationality', 'Start_Date', 'Eligible_Mentor']
+
+CATEGORICAL_COLUMNS = ['Role', 'Grade', 'Department', 'Location', 'Nationality', 'Eligible_Mentor']
+
+
+def _require_columns(df, columns, table):
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"{table} is missing required columns: {', '.join(missing)}")
+
+
+def _clean_ids(ids):
+    """Employee IDs as strings, without the '.0' pandas adds to numeric columns with gaps"""
+    ids = ids.astype('string').str.strip().str.replace(r'\.0$', '', regex=True)
+    return ids.mask(ids == '')
+
+
+def _clean_location(location):
+    """'RIYADH, Saudi Arabia' and 'Riyadh' both become 'Riyadh'"""
+    return location.astype('string').str.split(',').str[0].str.strip().str.title()
+
+
+def build_participants(mentors_real, mentees_real):
+    """Normalize the mentor and mentee roster exports into one participants table"""
+    mentors_real = mentors_real.rename(columns=str.strip)
+    mentees_real = mentees_real.rename(columns=str.strip)
+    _require_columns(mentors_real, MENTOR_SOURCE_COLUMNS, 'mentors_real_data')
+    _require_columns(mentees_real, MENTEE_SOURCE_COLUMNS, 'mentees_real_data')
+
+    mentors = pd.DataFrame({
+        'Participant_ID': _clean_ids(mentors_real['Nesma id']),
+        'Name': mentors_real['Mentors from LDP'],
+        'Email': mentors_real['Email'],
+        'Role': 'Mentor',
+        'Location': _clean_location(mentors_real['Location']),
+        'Eligible_Mentor': 'Yes',
+    })  # The mentor export has no grade, department, nationality or start date; they stay missing
+
+    mentees = pd.DataFrame({
+        'Participant_ID': _clean_ids(mentees_real['ID']),
+        'Name': mentees_real['Name'],
+        'Email': mentees_real['Email'],
+        'Role': 'Mentee',
+        'Grade': mentees_real['Postion'],
+        'Department': mentees_real['Department'],
+        'Location': _clean_location(mentees_real['Location']),
+        'Nationality': mentees_real['Nationality'],
+        'Start_Date': pd.to_datetime(mentees_real['Starting Years of services'], format='%m/%d/%Y', errors='coerce'),
+        'Eligible_Mentor': pd.NA,
+    })
+
+    participants = pd.concat([mentors, mentees], ignore_index=True)
+
+    # Drop blank export rows and repeated entries for the same employee
+    participants['Name'] = participants['Name'].astype('string').str.strip()
+    participants['Email'] = participants['Email'].astype('string').str.strip()
+    participants = participants[participants['Name'].notna() & (participants['Name'] != '')]
+    participants['Participant_ID'] = participants['Participant_ID'].fillna('email:' + participants['Email'].str.lower())
+    participants = participants.drop_duplicates(['Participant_ID', 'Role']).reset_index(drop=True)
+
+    for column in ['Grade', 'Department', 'Nationality']:
+        participants[column] = participants[column].astype('string').str.strip()
+    for column in CATEGORICAL_COLUMNS:
+        participants[column] = participants[column].astype('category')
+
+    return participants[PARTICIPANT_COLUMNS]
@@ -0,0 +1,31 @@
+import streamlit as st
+import plotly.express as px
+
+
+def show_performance_panel(profiler):
+    """Sidebar panel with p50/p95 render time per page section (HR only)"""
+    with st.sidebar.expander("⏱️ Performance"):
+        if profiler.mode == 'off':
+            st.caption("Profiling is off. Start it here for this server, or with MENTORSHIP_PROFILE=time.")
+            st.button("Start profiling", key="perf_start", on_click=profiler.set_mode, args=('time',))
+            return
+
+        st.button("Stop profiling", key="perf_stop", on_click=profiler.set_mode, args=('off',))
+        summary = profiler.summary()
+        if summary.empty:
+            st.caption("No sections recorded yet.")
+            return
+        columns = ['Section', 'Runs', 'p50_ms', 'p95_ms'] + (['p95_KB'] if profiler.mode == 'memory' else [])
+        st.dataframe(summary[columns], use_container_width=True, hide_index=True)
+
+        # Rolling histogram of one section's recent wall times
+        section = st.selectbox("Section", summary['Section'], key="perf_section")
+        fig = px.histogram(x=profiler.durations(section), nbins=30, labels={'x': 'ms'})
+        fig.update_layout(height=220, margin=dict(l=0, r=0, t=10, b=0), showlegend=False,
+                          yaxis_title="Reruns", plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+        st.plotly_chart(fig, use_container_width=True)
+
+        if profiler.log_path:
+            st.caption(f"Every rerun is logged to {profiler.log_path}")
+        if st.button("Reset statistics", key="perf_reset"):
+            profiler.clear()
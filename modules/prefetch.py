@@ -0,0 +1,62 @@
+"""Background prefetch of derived tables for the pages likely to be opened next
+
+Once a page has rendered, app.py schedules the derived tables of the pages that usually
+follow it (router.NEXT_PAGES) on a small thread pool shared by every session. Tasks call
+the same cached getters as the pages, so their results land in the bounded
+st.cache_resource entries of the current data version: a prefetch only computes what
+the next page would compute itself and never adds cache entries of its own. Long
+solves (the mentor assignment) are not prefetched, and each task opens its own data
+mapping when it starts, so a CSV that changed meanwhile is read at its new version.
+
+Tasks that have not started yet are cancelled when the session's next run begins, so
+prefetching never queues ahead of the page the user actually opens. A task that is
+already running finishes, and a page asking for the same value waits for it instead
+of computing it a second time.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+MAX_WORKERS = 2
+
+
+class Prefetcher:
+    """Bounded pool of prefetch tasks; a task name is only queued once at a time"""
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._pending = {}  # task name -> future, while queued or running
+        # Reentrant: a task that finished already runs its done callback inside schedule()
+        self._lock = threading.RLock()
+
+    def schedule(self, tasks, open_data):
+        """Queue tasks (name -> function(data)) not already in flight; returns their futures
+
+        open_data() is called when a task starts, so it reads the tables current at that
+        point instead of the frames a finished run has already loaded.
+        """
+        ctx = get_script_run_ctx()
+        futures = []
+        with self._lock:
+            for name, task in tasks.items():
+                if name in self._pending:
+                    continue
+                future = self._pool.submit(self._run, task, open_data, ctx)
+                self._pending[name] = future
+                future.add_done_callback(lambda _, name=name: self._finish(name))
+                futures.append(future)
+        return futures
+
+    def _run(self, task, open_data, ctx):
+        # The scheduling session's context lets the task use the Streamlit caches
+        add_script_run_ctx(threading.current_thread(), ctx)
+        task(open_data())
+
+    def _finish(self, name):
+        with self._lock:
+            self._pending.pop(name, None)
+
+    def cancel(self, futures):
+        """Drop the given tasks that have not started; running ones complete"""
+        for future in futures:
+            future.cancel()
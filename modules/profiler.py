@@ -0,0 +1,147 @@
+"""Lightweight section profiler for page reruns
+
+Pages wrap their sections in `with span('name'):`. Each span records its wall time,
+and with memory tracing on, the memory allocated while it ran. Durations go into a
+rolling window per section (for p50/p95), and every finished rerun is appended as one
+JSON line to the profile log.
+
+MENTORSHIP_PROFILE selects the mode the process starts in: 'off' (default), 'time' or
+'memory' (adds tracemalloc, which slows allocation-heavy code). HR can also switch
+timing on and off from the performance panel; nothing is logged while it is off.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+import numpy as np
+import pandas as pd
+from modules.data_cache import DATA_DIR
+
+PROFILE_LOG = 'profile.jsonl'
+PROFILE_MODES = ('off', 'time', 'memory')
+# Reruns kept per section for the percentiles
+WINDOW = 500
+
+
+def profile_mode():
+    mode = os.environ.get('MENTORSHIP_PROFILE', 'off')
+    return mode if mode in PROFILE_MODES else 'off'
+
+
+def profile_log_path(data_dir=DATA_DIR):
+    return os.path.join(data_dir, PROFILE_LOG)
+
+
+class Profiler:
+    """Span timings for one process; each rerun (thread) collects its own spans"""
+
+    def __init__(self, mode='time', log_path=None, window=WINDOW):
+        self.mode = mode
+        self.log_path = log_path
+        self._durations = defaultdict(lambda: deque(maxlen=window))
+        self._allocations = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.set_mode(mode)
+
+    def set_mode(self, mode):
+        """Switch profiling for the whole process, e.g. from the HR panel"""
+        if mode == 'memory' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.mode = mode
+
+    def begin_run(self, page):
+        """Start collecting the spans of one rerun"""
+        self._local.run = {'page': page, 'spans': []}
+
+    @contextmanager
+    def run(self, page):
+        """Collect the enclosed spans as one rerun, logged even when the block returns early or
+        raises; inside a rerun that is already open (a fragment in a full run) it adds to that one"""
+        if getattr(self._local, 'run', None) is not None:
+            yield
+            return
+        self.begin_run(page)
+        try:
+            yield
+        finally:
+            self.end_run()
+
+    @contextmanager
+    def span(self, name):
+        """Time the enclosed block as section `name`"""
+        if self.mode == 'off':
+            yield
+            return
+        trace = self.mode == 'memory' and tracemalloc.is_tracing()
+        before = tracemalloc.get_traced_memory()[0] if trace else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            kb = (tracemalloc.get_traced_memory()[0] - before) / 1024 if trace else None
+            self._record(name, ms, kb)
+
+    def profiled(self, name):
+        """Decorator form of span()"""
+        def decorate(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def _record(self, name, ms, kb):
+        with self._lock:
+            self._durations[name].append(ms)
+            if kb is not None:
+                self._allocations[name].append(kb)
+        run = getattr(self._local, 'run', None)
+        if run is not None:
+            run['spans'].append({'name': name, 'ms': round(ms, 2), 'kb': None if kb is None else round(kb, 1)})
+
+    def end_run(self):
+        """Finish the current rerun and append it to the profile log"""
+        run, self._local.run = getattr(self._local, 'run', None), None
+        if run is None or not run['spans'] or self.log_path is None:
+            return run
+        line = json.dumps(dict(run, time=datetime.now().isoformat(timespec='seconds')))
+        try:
+            with open(self.log_path, 'a') as f:
+                f.write(line + '\n')
+        except OSError:
+            pass
+        return run
+
+    def summary(self):
+        """Runs, p50, p95 and max wall time (and p95 allocation) per section, slowest p95 first"""
+        with self._lock:
+            durations = {name: np.array(values) for name, values in self._durations.items() if values}
+            allocations = {name: np.array(values) for name, values in self._allocations.items() if values}
+        rows = [{
+            'Section': name,
+            'Runs': len(values),
+            'p50_ms': round(float(np.percentile(values, 50)), 1),
+            'p95_ms': round(float(np.percentile(values, 95)), 1),
+            'Max_ms': round(float(values.max()), 1),
+            'p95_KB': round(float(np.percentile(allocations[name], 95)), 1) if name in allocations else None,
+        } for name, values in durations.items()]
+        columns = ['Section', 'Runs', 'p50_ms', 'p95_ms', 'Max_ms', 'p95_KB']
+        return pd.DataFrame(rows, columns=columns).sort_values('p95_ms', ascending=False, ignore_index=True)
+
+    def durations(self, name):
+        """Recent wall times of one section, oldest first"""
+        with self._lock:
+            return list(self._durations.get(name, ()))
+
+    def clear(self):
+        with self._lock:
+            self._durations.clear()
+            self._allocations.clear()
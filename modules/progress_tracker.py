@@ -3,50 +3,15 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import random
-
-def create_random_mentor_mentee_mapping(data):
-    """Create random mapping between mentors and mentees from real data"""
-    mentors_real = data['mentors_real_data'].copy()
-    mentees_real = data['mentees_real_data'].copy()
-    
-    # Clean column names
-    mentors_real.columns = mentors_real.columns.str.strip()
-    mentees_real.columns = mentees_real.columns.str.strip()
-    
-    # Get mentor and mentee names
-    mentor_names = mentors_real['Mentors from LDP'].dropna().tolist()
-    mentee_names = mentees_real['Name'].dropna().tolist()
-    
-    # Create random mappings - each mentor gets 2-3 mentees
-    mappings = []
-    mentee_index = 0
-    
-    for mentor in mentor_names:
-        # Assign 2-3 mentees per mentor randomly
-        num_mentees = random.randint(2, min(3, len(mentee_names) - mentee_index))
-        
-        for i in range(num_mentees):
-            if mentee_index < len(mentee_names):
-                mappings.append({
-                    'Mentor_Name': mentor,
-                    'Mentee_Name': mentee_names[mentee_index],
-                    'Session_Date': '2025-08-15',
-                    'Session_Notes': f'Session between {mentor} and {mentee_names[mentee_index]}'
-                })
-                mentee_index += 1
-    
-    return pd.DataFrame(mappings)
+from modules.alerts import ENGAGEMENT_RULES, evaluate_rules
+from modules.derived_data import (get_participants, get_engagement_facts, get_participant_sessions,
+                                  get_pairing_sessions, get_assignments, search_participants)
 
 def show_progress_tracker(data):
     """Detailed Progress Tracker - Mentor and Mentee Overview with Session Details"""
     st.title("Detailed Progress Tracker")
     st.markdown("### Comprehensive Mentor-Mentee Progress Monitoring")
     
-    # Create random mapping if not exists in session state
-    if 'mentor_mentee_mapping' not in st.session_state:
-        st.session_state.mentor_mentee_mapping = create_random_mentor_mentee_mapping(data)
-    
     # Top selector: Mentor or Mentee
     st.subheader("Select View Type")
     view_type = st.selectbox("Choose view:", ["Mentor View", "Mentee View"])
@@ -64,43 +29,12 @@ def show_mentor_view(data):
     # 1. Mentor Selection & Overview
     st.subheader("Mentor Selection & Overview")
     
-    # Get mentor data from real data files
-    mentors_real = data['mentors_real_data'].copy()
-    mentees_real = data['mentees_real_data'].copy()
-    
-    # Clean column names
-    mentors_real.columns = mentors_real.columns.str.strip()
-    mentees_real.columns = mentees_real.columns.str.strip()
-    
-    # Use real mentor names
-    mentor_names = mentors_real['Mentors from LDP'].dropna().tolist()
-    
-    # Also get real mentee names for demo purposes
-    mentee_names_real = mentees_real['Name'].dropna().tolist()
-    
-    participants_data = data['all_participants'].copy()
-    
-    # Add mock engagement data for tracker metrics
-    participants_data['Total_Sessions'] = [24, 18, 12, 22, 28, 8, 16, 6, 20, 14, 12, 8, 15, 10, 6, 9, 11, 7, 13, 5]
-    participants_data['Sessions_This_Month'] = [4, 3, 2, 5, 6, 1, 3, 1, 4, 2, 2, 1, 3, 2, 0, 2, 2, 1, 3, 1]
-    participants_data['Last_Session_Date'] = ['2025-08-15', '2025-08-12', '2025-07-20', '2025-08-18', '2025-08-19', 
-                                            '2025-08-05', '2025-08-14', '2025-07-25', '2025-08-16', '2025-08-10',
-                                            '2025-08-15', '2025-07-28', '2025-08-17', '2025-08-12', '2025-07-15',
-                                            '2025-08-14', '2025-08-11', '2025-08-08', '2025-08-16', '2025-08-06']
-    participants_data['Engagement_Status'] = ['Active', 'Active', 'At Risk', 'Active', 'Active', 'At Risk', 'Active', 'At Risk', 'Active', 'Active',
-                                             'Active', 'At Risk', 'Active', 'Active', 'Dropped', 'Active', 'Active', 'At Risk', 'Active', 'At Risk']
-    participants_data['Goal_Progress'] = [85, 92, 65, 88, 95, 45, 78, 35, 82, 70, 75, 40, 85, 60, 20, 68, 72, 45, 80, 35]
-    participants_data['Mentor_Satisfaction'] = [4.5, 4.8, 4.2, 4.7, 4.9, 3.9, 4.3, 3.7, 4.6, 4.4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-    participants_data['Mentee_Satisfaction'] = [4.2, 4.6, 3.8, 4.4, 4.7, 3.5, 4.1, 3.2, 4.3, 4.0, 4.5, 3.8, 4.6, 4.2, 2.5, 4.3, 4.1, 3.6, 4.4, 3.9]
-    
-    # Convert numeric columns to proper types
-    participants_data['Goal_Progress'] = pd.to_numeric(participants_data['Goal_Progress'], errors='coerce').fillna(0)
-    participants_data['Total_Sessions'] = pd.to_numeric(participants_data['Total_Sessions'], errors='coerce').fillna(0)
-    participants_data['Sessions_This_Month'] = pd.to_numeric(participants_data['Sessions_This_Month'], errors='coerce').fillna(0)
-    participants_data['Mentor_Satisfaction'] = pd.to_numeric(participants_data['Mentor_Satisfaction'], errors='coerce').fillna(0)
-    participants_data['Mentee_Satisfaction'] = pd.to_numeric(participants_data['Mentee_Satisfaction'], errors='coerce').fillna(0)
-    
-    engagement_data = participants_data
+    # Use real mentor names from the canonical participants table
+    participants = get_participants(data)
+    mentor_names = participants.loc[participants['Role'] == 'Mentor', 'Name'].tolist()
+    
+    # Engagement fact table, built once per data version
+    engagement_data = get_engagement_facts(data)
     # Use real mentor data instead of filtered participants
     if not mentor_names:
         # Fallback to original data if real data is empty
@@ -116,14 +50,21 @@ def show_mentor_view(data):
     
     # Filter mentors based on search
     if mentor_search:
-        filtered_mentors = [name for name in mentor_names if mentor_search.lower() in name.lower()]
+        # Ranked index lookup (name, email or ID, typo tolerant), kept to the names listed here
+        listed = set(mentor_names)
+        ranked = search_participants(data, mentor_search, role='Mentor')['Name']
+        filtered_mentors = [name for name in dict.fromkeys(ranked) if name in listed]
         if filtered_mentors:
             mentor_names = filtered_mentors
         else:
             st.warning("No mentors found matching your search.")
             return
     
-    selected_mentor = st.selectbox("Select a mentor:", mentor_names)
+    # A deep link (?page=progress_tracker&mentor=...) preselects its mentor; the URL follows the selection
+    linked_mentor = st.session_state.get('selected_mentor')
+    selected_mentor = st.selectbox("Select a mentor:", mentor_names,
+                                   index=mentor_names.index(linked_mentor) if linked_mentor in mentor_names else 0)
+    st.query_params['mentor'] = selected_mentor
     
     # Get selected mentor data - create mock data for real mentors
     # Since we're using real mentor names, we need to create mock engagement data
@@ -134,6 +75,13 @@ def show_mentor_view(data):
     }
     mentor_info = mock_mentor_data
     
+    # Use the session-notes rollup once the mentor has logged sessions
+    participant_sessions = get_participant_sessions(data)
+    logged = participant_sessions[participant_sessions['Name'] == selected_mentor]
+    if len(logged) > 0:
+        mentor_info = dict(mentor_info, Total_Sessions=int(logged.iloc[0]['Sessions']),
+                           Sessions_This_Month=logged.iloc[0]['Monthly_Cadence'])
+    
     # Display mentor summary
     col1, col2, col3, col4, col5 = st.columns(5)
     
@@ -162,14 +110,18 @@ def show_mentor_view(data):
     # 2. Mentor's Mentee Overview
     st.subheader("Mentor's Mentee Overview")
     
-    # Get mentees for this mentor from random mapping
-    mapping_data = st.session_state.mentor_mentee_mapping
+    # Get mentees for this mentor from the shared assignment
+    mapping_data = get_assignments(data)
     mentor_sessions = mapping_data[mapping_data['Mentor_Name'] == selected_mentor]
     
     if len(mentor_sessions) == 0:
-        st.info(f"No mentees assigned to {selected_mentor} in the current mapping.")
+        st.info(f"No mentees assigned to {selected_mentor} in the current assignment.")
         return
     
+    # Session rollups for this mentor's pairings, keyed by mentee
+    pairing_sessions = get_pairing_sessions(data)
+    pairing_sessions = pairing_sessions[pairing_sessions['Mentor_Name'] == selected_mentor].set_index('Mentee_Name')
+    
     # Create mentee overview table
     mentee_overview = []
     for _, session in mentor_sessions.iterrows():
@@ -179,14 +131,23 @@ def show_mentor_view(data):
         import random
         random.seed(hash(mentee_name))  # Consistent random data for each mentee
         
-        mentee_overview.append({
+        overview = {
             'Mentee Name': mentee_name,
             'Sessions Completed': random.randint(8, 25),
             'Avg Sessions/Month': random.randint(2, 6),
             'Goal Progress (%)': random.randint(60, 95),
             'Last Session Date': '2025-08-15',
             'Engagement Status': random.choice(['Active', 'Active', 'Active', 'At Risk'])
-        })
+        }
+        
+        # Real session counts, cadence and recency where the pairing has logged sessions
+        if mentee_name in pairing_sessions.index:
+            pairing = pairing_sessions.loc[mentee_name]
+            overview['Sessions Completed'] = int(pairing['Sessions'])
+            overview['Avg Sessions/Month'] = pairing['Monthly_Cadence']
+            overview['Last Session Date'] = pairing['Last_Session'].strftime('%Y-%m-%d')
+        
+        mentee_overview.append(overview)
     
     if mentee_overview:
         mentee_df = pd.DataFrame(mentee_overview)
@@ -218,40 +179,12 @@ def show_mentee_view(data):
     
     st.subheader("Mentee Selection & Overview")
     
-    # Get mentee data from real data files
-    mentors_real = data['mentors_real_data'].copy()
-    mentees_real = data['mentees_real_data'].copy()
-    
-    # Clean column names
-    mentors_real.columns = mentors_real.columns.str.strip()
-    mentees_real.columns = mentees_real.columns.str.strip()
-    
-    # Use real mentee names
-    mentee_names_real = mentees_real['Name'].dropna().tolist()
-    
-    participants_data = data['all_participants'].copy()
-    
-    # Add mock engagement data for tracker metrics
-    participants_data['Total_Sessions'] = [24, 18, 12, 22, 28, 8, 16, 6, 20, 14, 12, 8, 15, 10, 6, 9, 11, 7, 13, 5]
-    participants_data['Sessions_This_Month'] = [4, 3, 2, 5, 6, 1, 3, 1, 4, 2, 2, 1, 3, 2, 0, 2, 2, 1, 3, 1]
-    participants_data['Last_Session_Date'] = ['2025-08-15', '2025-08-12', '2025-07-20', '2025-08-18', '2025-08-19', 
-                                            '2025-08-05', '2025-08-14', '2025-07-25', '2025-08-16', '2025-08-10',
-                                            '2025-08-15', '2025-07-28', '2025-08-17', '2025-08-12', '2025-07-15',
-                                            '2025-08-14', '2025-08-11', '2025-08-08', '2025-08-16', '2025-08-06']
-    participants_data['Engagement_Status'] = ['Active', 'Active', 'At Risk', 'Active', 'Active', 'At Risk', 'Active', 'At Risk', 'Active', 'Active',
-                                             'Active', 'At Risk', 'Active', 'Active', 'Dropped', 'Active', 'Active', 'At Risk', 'Active', 'At Risk']
-    participants_data['Goal_Progress'] = [85, 92, 65, 88, 95, 45, 78, 35, 82, 70, 75, 40, 85, 60, 20, 68, 72, 45, 80, 35]
-    participants_data['Mentor_Satisfaction'] = [4.5, 4.8, 4.2, 4.7, 4.9, 3.9, 4.3, 3.7, 4.6, 4.4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-    participants_data['Mentee_Satisfaction'] = [4.2, 4.6, 3.8, 4.4, 4.7, 3.5, 4.1, 3.2, 4.3, 4.0, 4.5, 3.8, 4.6, 4.2, 2.5, 4.3, 4.1, 3.6, 4.4, 3.9]
-    
-    # Convert numeric columns to proper types
-    participants_data['Goal_Progress'] = pd.to_numeric(participants_data['Goal_Progress'], errors='coerce').fillna(0)
-    participants_data['Total_Sessions'] = pd.to_numeric(participants_data['Total_Sessions'], errors='coerce').fillna(0)
-    participants_data['Sessions_This_Month'] = pd.to_numeric(participants_data['Sessions_This_Month'], errors='coerce').fillna(0)
-    participants_data['Mentor_Satisfaction'] = pd.to_numeric(participants_data['Mentor_Satisfaction'], errors='coerce').fillna(0)
-    participants_data['Mentee_Satisfaction'] = pd.to_numeric(participants_data['Mentee_Satisfaction'], errors='coerce').fillna(0)
-    
-    engagement_data = participants_data
+    # Use real mentee names from the canonical participants table
+    participants = get_participants(data)
+    mentee_names_real = participants.loc[participants['Role'] == 'Mentee', 'Name'].tolist()
+    
+    # Engagement fact table, built once per data version
+    engagement_data = get_engagement_facts(data)
     
     # Use real mentee names instead of filtered participants
     if mentee_names_real:
@@ -270,7 +203,10 @@ def show_mentee_view(data):
     
     # Filter mentees based on search
     if mentee_search:
-        filtered_mentees = [name for name in mentee_names if mentee_search.lower() in name.lower()]
+        # Ranked index lookup (name, email or ID, typo tolerant), kept to the names listed here
+        listed = set(mentee_names)
+        ranked = search_participants(data, mentee_search, role='Mentee')['Name']
+        filtered_mentees = [name for name in dict.fromkeys(ranked) if name in listed]
         if filtered_mentees:
             mentee_names = filtered_mentees
         else:
@@ -279,8 +215,8 @@ def show_mentee_view(data):
     
     selected_mentee = st.selectbox("Select a mentee:", mentee_names)
     
-    # Find mentor for this mentee from random mapping
-    mapping_data = st.session_state.mentor_mentee_mapping
+    # Find mentor for this mentee from the shared assignment
+    mapping_data = get_assignments(data)
     mentee_sessions = mapping_data[mapping_data['Mentee_Name'] == selected_mentee]
     
     if len(mentee_sessions) > 0:
@@ -291,19 +227,17 @@ def show_mentee_view(data):
         st.subheader("Assigned Mentor Profile")
         
         # Get mentor details from real data
-        mentors_real = data['mentors_real_data'].copy()
-        mentors_real.columns = mentors_real.columns.str.strip()
-        mentor_data = mentors_real[mentors_real['Mentors from LDP'] == mentor_name]
+        mentor_data = participants[(participants['Role'] == 'Mentor') & (participants['Name'] == mentor_name)]
         
         if len(mentor_data) > 0:
             mentor_info = mentor_data.iloc[0]
             
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Name", f"{mentor_info['Mentors from LDP']}")
+                st.metric("Name", f"{mentor_info['Name']}")
                 st.metric("Position", "Senior Leader")  # Mock position
             with col2:
-                st.metric("Location", mentor_info.get('Location', 'N/A'))
+                st.metric("Location", mentor_info['Location'] if pd.notna(mentor_info['Location']) else 'N/A')
                 # Mock years of service data
                 years_of_service = 5 + hash(mentor_name) % 10
                 st.metric("Years of Service", f"{years_of_service} years")
@@ -313,40 +247,41 @@ def show_mentee_view(data):
                 
         show_mentee_detail(data, selected_mentee, mentor_name)
     else:
-        st.info("No mentor assigned to this mentee in the current mapping.")
+        st.info("No mentor assigned to this mentee in the current assignment.")
 
 def show_mentee_detail(data, mentee_name, mentor_name):
     """Detailed view for a specific mentee"""
     
-    # Get mentee data from all_participants
-    participants_data = data['all_participants'].copy()
-    
-    # Add mock engagement data
-    participants_data['Total_Sessions'] = [24, 18, 12, 22, 28, 8, 16, 6, 20, 14, 12, 8, 15, 10, 6, 9, 11, 7, 13, 5]
-    participants_data['Last_Session_Date'] = ['2025-08-15', '2025-08-12', '2025-07-20', '2025-08-18', '2025-08-19', 
-                                            '2025-08-05', '2025-08-14', '2025-07-25', '2025-08-16', '2025-08-10',
-                                            '2025-08-15', '2025-07-28', '2025-08-17', '2025-08-12', '2025-07-15',
-                                            '2025-08-14', '2025-08-11', '2025-08-08', '2025-08-16', '2025-08-06']
-    participants_data['Engagement_Status'] = ['Active', 'Active', 'At Risk', 'Active', 'Active', 'At Risk', 'Active', 'At Risk', 'Active', 'Active',
-                                             'Active', 'At Risk', 'Active', 'Active', 'Dropped', 'Active', 'Active', 'At Risk', 'Active', 'At Risk']
-    participants_data['Goal_Progress'] = [85, 92, 65, 88, 95, 45, 78, 35, 82, 70, 75, 40, 85, 60, 20, 68, 72, 45, 80, 35]
-    participants_data['Mentor_Satisfaction'] = [4.5, 4.8, 4.2, 4.7, 4.9, 3.9, 4.3, 3.7, 4.6, 4.4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-    participants_data['Mentee_Satisfaction'] = [4.2, 4.6, 3.8, 4.4, 4.7, 3.5, 4.1, 3.2, 4.3, 4.0, 4.5, 3.8, 4.6, 4.2, 2.5, 4.3, 4.1, 3.6, 4.4, 3.9]
-    
-    # Since we're using real mentee names, create mock data for them
-    import random
-    random.seed(hash(mentee_name))  # Consistent data for each mentee
-    
-    # Create mock mentee info
-    mentee_info = {
-        'Name': mentee_name,
-        'Total_Sessions': random.randint(8, 25),
-        'Last_Session_Date': '2025-08-15',
-        'Engagement_Status': random.choice(['Active', 'Active', 'Active', 'At Risk']),
-        'Goal_Progress': random.randint(60, 95),
-        'Mentor_Satisfaction': random.uniform(4.0, 5.0),
-        'Mentee_Satisfaction': random.uniform(3.8, 4.8)
-    }
+    # Get mentee engagement from the fact table
+    engagement_data = get_engagement_facts(data)
+    mentee_rows = engagement_data[engagement_data['Name'] == mentee_name]
+    
+    if len(mentee_rows) > 0:
+        mentee_row = mentee_rows.iloc[0]
+        mentee_info = {
+            'Name': mentee_name,
+            'Total_Sessions': int(mentee_row['Total_Sessions']) if pd.notna(mentee_row['Total_Sessions']) else 'N/A',
+            'Last_Session_Date': mentee_row['Last_Session_Date'].strftime('%Y-%m-%d') if pd.notna(mentee_row['Last_Session_Date']) else 'N/A',
+            'Engagement_Status': mentee_row['Engagement_Status'],
+            'Goal_Progress': mentee_row['Goal_Progress'],
+            'Mentor_Satisfaction': mentee_row['Mentor_Satisfaction'],
+            'Mentee_Satisfaction': mentee_row['Mentee_Satisfaction'],
+            'Risk_Flag': mentee_row['Risk_Flag']
+        }
+    else:
+        # Roster mentees have no engagement record yet, create mock data for them
+        import random
+        random.seed(hash(mentee_name))  # Consistent data for each mentee
+        
+        mentee_info = {
+            'Name': mentee_name,
+            'Total_Sessions': random.randint(8, 25),
+            'Last_Session_Date': '2025-08-15',
+            'Engagement_Status': random.choice(['Active', 'Active', 'Active', 'At Risk']),
+            'Goal_Progress': random.randint(60, 95),
+            'Mentor_Satisfaction': random.uniform(4.0, 5.0),
+            'Mentee_Satisfaction': random.uniform(3.8, 4.8)
+        }
     
     # A. Snapshot
     st.subheader(f"{mentee_name} - Snapshot")
@@ -380,6 +315,10 @@ def show_mentee_detail(data, mentee_name, mentor_name):
         col1, col2, col3 = st.columns([3, 1, 1])
         with col1:
             st.write(f"**{goal['Goal']}**")
+        if pd.isna(goal['Progress']):
+            with col2:
+                st.write("No progress recorded")
+            continue
         with col2:
             st.progress(goal['Progress'] / 100)
         with col3:
@@ -416,11 +355,6 @@ def show_mentee_detail(data, mentee_name, mentor_name):
     with col1:
         st.write("**Mentor Feedback:**")
         if pd.notna(mentee_info['Mentor_Satisfaction']):
-            mentor_satisfaction = data['enhanced_engagement'][
-                data['enhanced_engagement']['Participant_Name'] == mentor_name
-            ]['Mentor_Satisfaction'].iloc[0] if len(data['enhanced_engagement'][
-                data['enhanced_engagement']['Participant_Name'] == mentor_name
-            ]) > 0 else 0
             st.metric("Mentor Rating", "5.0/5.0")
         else:
             st.info("No mentor feedback available.")
@@ -435,28 +369,9 @@ def show_mentee_detail(data, mentee_name, mentor_name):
     # Automated Alerts
     st.subheader("🚨 Automated Alerts")
     
-    alerts = []
-    
-    # Check for no session in last 30 days
-    risk_flag = mentee_info.get('Risk_Flag', '')
-    if risk_flag == 'No session in 30 days':
-        alerts.append("**No session in last 30 days** - Immediate attention required")
-    
-    # Check for goals not updated
-    if risk_flag == 'Goals not updated':
-        alerts.append("**Goals not updated** - Goal progress needs review")
-    
-    # Check for low engagement
-    if mentee_info['Engagement_Status'] == 'At Risk':
-        alerts.append("**Low engagement detected** - Consider additional support")
-    
-    # Check for low goal progress
-    if mentee_info['Goal_Progress'] < 50:
-        alerts.append("**Low goal progress** - Review and adjust goals")
-    
-    # Check for low satisfaction
-    if mentee_info['Mentee_Satisfaction'] < 3.5:
-        alerts.append("**Low satisfaction score** - Schedule feedback session")
+    # Same rules the HR dashboard evaluates for everyone, applied to this mentee's row
+    alerts = evaluate_rules(pd.DataFrame([mentee_info]), ENGAGEMENT_RULES)
+    alerts = [f"**{alert['Alert']}** - {alert['Action']}" for _, alert in alerts.iterrows()]
     
     if alerts:
         for alert in alerts:
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from modules.event_log import append_events
 
 def show_resource_library(data):
     """Module 5: Live Access to Library"""
@@ -39,6 +40,8 @@ def show_resource_library(data):
             if st.button("Upload Resource", type="primary"):
                 if uploaded_file and resource_name:
                     # Simulate successful upload
+                    append_events([{'type': 'Resource', 'message': f"New resource uploaded: {resource_name}",
+                                    'category': category}])
                     st.success(f"Resource '{resource_name}' uploaded successfully!")
                     st.info(f"File: {uploaded_file.name} | Category: {category}")
                 else:
@@ -59,7 +62,7 @@ def show_resource_library(data):
         search_term = st.text_input("Search Resources:", placeholder="Enter resource name...")
     
     # Apply filters
-    filtered_resources = data['resources'].copy()
+    filtered_resources = data['resources']
     
     if category_filter != "All":
         filtered_resources = filtered_resources[filtered_resources['Category'] == category_filter]
@@ -76,7 +79,7 @@ def show_resource_library(data):
     st.subheader("Available Resources")
     
     # Add download buttons
-    display_df = filtered_resources.copy()
+    display_df = filtered_resources.copy(deep=False)  # copy-on-write: only the added column takes new memory
     
     # Create download column
     download_buttons = []
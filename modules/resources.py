@@ -34,7 +34,7 @@ def show_resources(data):
         category_filter = st.selectbox("Filter by category:", ["All"] + list(data['resources']['Category'].unique()))
     
     # Apply filters
-    filtered_resources = data['resources'].copy()
+    filtered_resources = data['resources']
     
     if search_term:
         filtered_resources = filtered_resources[
@@ -0,0 +1,59 @@
+import importlib
+from functools import lru_cache
+import streamlit as st
+
+# Page key -> (sidebar label, or None for pages only reached by link; page functions, run in order)
+PAGES = {
+    'hr_dashboard': ("HR Dashboard", ['modules.hr_dashboard:show_hr_dashboard']),
+    'mentor_eligibility': ("All Participants", ['modules.mentor_eligibility:show_mentor_eligibility']),
+    'progress_tracker': ("Progress Tracker", ['modules.progress_tracker:show_progress_tracker']),
+    'resource_library': ("Resource Library", ['modules.resource_library:show_resource_library']),
+    'smart_goals': (None, ['modules.smart_goals:show_smart_goals']),
+    'mentor_community': (None, ['modules.mentor_community:show_mentor_community', 'modules.resources:show_resources']),
+}
+DEFAULT_PAGE = 'hr_dashboard'
+# Page key -> pages usually opened next; their derived tables are prefetched once it has rendered
+NEXT_PAGES = {
+    'hr_dashboard': ['mentor_eligibility', 'progress_tracker'],
+    'mentor_eligibility': ['progress_tracker'],
+    'progress_tracker': ['mentor_eligibility'],
+}
+# Deep-link query parameters -> session state keys the pages read, e.g. ?page=progress_tracker&mentor=...
+LINK_PARAMS = {'mentor': 'selected_mentor'}
+
+
+def sidebar_pages():
+    """Sidebar label -> page key, in registry order"""
+    return {label: page for page, (label, _) in PAGES.items() if label}
+
+
+@lru_cache(maxsize=None)
+def page_functions(page):
+    """A page's render functions, imported on first use and kept for later runs"""
+    targets = (target.split(':') for target in PAGES[page][1])
+    return [getattr(importlib.import_module(module), function) for module, function in targets]
+
+
+def current_page():
+    """Page to render in this run; a session's first run follows the ?page= deep link"""
+    if 'selected_page' not in st.session_state:
+        page = st.query_params.get('page', DEFAULT_PAGE)
+        st.session_state.selected_page = page if page in PAGES else DEFAULT_PAGE
+        for param, state_key in LINK_PARAMS.items():
+            if param in st.query_params:
+                st.session_state[state_key] = st.query_params[param]
+    return st.session_state.selected_page
+
+
+def navigate(page):
+    """Button callback: callbacks run before the script, so the click renders the new page in one run"""
+    st.session_state.selected_page = page
+    for state_key in LINK_PARAMS.values():
+        st.session_state[state_key] = None
+    st.query_params.clear()
+    st.query_params['page'] = page
+
+
+def show_page(page, data):
+    for render in page_functions(page):
+        render(data)
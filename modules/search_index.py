@@ -0,0 +1,93 @@
+import unicodedata
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ('Name', 'Email', 'Participant_ID')
+# Share of the query's trigrams a row must contain to count as a fuzzy match
+FUZZY_THRESHOLD = 0.5
+# Separates fields so a match never spans two of them
+FIELD_SEPARATOR = ' \x1f '
+
+
+def normalize(text):
+    """Case- and accent-insensitive form of a search string"""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.casefold().split())
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    """Bigram/trigram inverted index over participant names, emails and IDs
+
+    search() returns row positions into the indexed frame, best matches first:
+    exact field matches, then word-prefix matches, then substrings, then fuzzy
+    (typo-tolerant) matches ranked by trigram overlap.
+    """
+
+    def __init__(self, frame, fields=SEARCH_FIELDS):
+        fields = [f for f in fields if f in frame.columns]
+        self.size = len(frame)
+        self._fields = [[normalize(v) if pd.notna(v) else '' for v in frame[f]] for f in fields]
+        # Padded with spaces so word starts and ends get their own grams
+        self._texts = [' ' + FIELD_SEPARATOR.join(values) + ' ' for values in zip(*self._fields)]
+
+        postings = defaultdict(list)
+        for row, text in enumerate(self._texts):
+            for gram in _grams(text, 2) | _grams(text, 3):
+                postings[gram].append(row)
+        self._postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+        exact = defaultdict(set)
+        for values in self._fields:
+            for row, value in enumerate(values):
+                exact[value].add(row)
+        self._exact = {value: sorted(rows) for value, rows in exact.items() if value}
+
+    def _rows_with(self, gram):
+        return self._postings.get(gram, np.empty(0, dtype=np.int32))
+
+    def _substring_candidates(self, query):
+        """Rows containing every n-gram of the query - a superset of the substring matches"""
+        if len(query) < 2:
+            return np.arange(self.size)  # a single character has no gram to look up: scan every row
+        n = 3 if len(query) >= 3 else 2
+        candidates = None
+        for gram in sorted(_grams(query, n), key=lambda g: len(self._rows_with(g))):
+            rows = self._rows_with(gram)
+            candidates = rows if candidates is None else np.intersect1d(candidates, rows, assume_unique=True)
+            if len(candidates) == 0:
+                break
+        return candidates
+
+    def _matching(self, rows, needle):
+        texts = self._texts
+        return rows[np.fromiter((needle in texts[row] for row in rows), dtype=bool, count=len(rows))]
+
+    def search(self, query, fuzzy=True, limit=None):
+        """Row positions matching query, best first"""
+        query = normalize(query)
+        if not query:
+            return np.arange(self.size)
+
+        # Tiers: 3 exact field value, 2 word prefix, 1 substring, below 1 fuzzy similarity
+        scores = np.zeros(self.size)
+        substring = self._matching(self._substring_candidates(query), query)
+        scores[substring] = 1
+        scores[self._matching(substring, ' ' + query)] = 2
+        scores[self._exact.get(query, [])] = 3
+
+        if fuzzy and len(query) >= 3:
+            query_grams = _grams(' ' + query + ' ', 3)
+            counts = np.bincount(np.concatenate([self._rows_with(g) for g in query_grams]), minlength=self.size)
+            similarity = counts / len(query_grams) * 0.99
+            fuzzy_rows = (scores == 0) & (similarity >= FUZZY_THRESHOLD * 0.99)
+            scores[fuzzy_rows] = similarity[fuzzy_rows]
+
+        matches = np.flatnonzero(scores)
+        ranked = matches[np.lexsort((matches, -scores[matches]))]
+        return ranked[:limit] if limit else ranked
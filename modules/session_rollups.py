@@ -0,0 +1,236 @@
+import csv
+import io
+import os
+import pickle
+import zlib
+from contextlib import contextmanager
+from datetime import date
+import numpy as np
+import pandas as pd
+from modules.data_cache import CACHE_DIR, DATA_DIR, table_path
+from modules.event_log import append_events, session_note_events
+
+try:
+    import fcntl
+except ImportError:  # Windows - single writer assumed
+    fcntl = None
+
+STATE_FILE = 'session_rollups.pkl'
+LOCK_FILE = 'session_rollups.lock'
+PAIR_KEYS = ['Mentor_Name', 'Mentee_Name']
+# Bytes just before the watermark that must be unchanged for the log to count as append-only
+FINGERPRINT_BYTES = 256
+
+ROLLUP_COLUMNS = ['Sessions', 'First_Session', 'Last_Session', 'Avg_Duration', 'Monthly_Cadence',
+                  'Sessions_This_Month', 'Days_Since_Last_Session']
+
+PAIRING_AGG = {
+    'Sessions': 'sum',
+    'Total_Minutes': 'sum',
+    'Timed_Sessions': 'sum',
+    'First_Session': 'min',
+    'Last_Session': 'max',
+}
+
+
+def _empty_state():
+    return {
+        'offset': 0,
+        'fingerprint': 0,
+        'columns': None,
+        'pairings': pd.DataFrame(columns=list(PAIRING_AGG)),
+        'monthly': pd.DataFrame(columns=['Sessions']),
+    }
+
+
+def _state_path(data_dir):
+    return os.path.join(data_dir, CACHE_DIR, STATE_FILE)
+
+
+def load_state(data_dir=DATA_DIR):
+    """Last persisted rollup state, or an empty one"""
+    try:
+        with open(_state_path(data_dir), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return _empty_state()
+
+
+def _save_state(state, data_dir):
+    path = _state_path(data_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(state, f)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
+
+
+@contextmanager
+def _state_lock(data_dir):
+    """Exclusive lock around a read-modify-write of the state, shared by the app's threads,
+    its other workers and the alert scanner"""
+    path = os.path.join(data_dir, CACHE_DIR, LOCK_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _field_count(record):
+    return len(next(csv.reader(io.StringIO(record.decode('utf-8', errors='replace'))), []))
+
+
+def _complete_records(chunk, fields):
+    """Length of chunk up to the end of its last complete CSV record
+
+    A newline inside a quoted field does not end a record. A final record without a
+    trailing newline counts as complete once its quotes are balanced and it has all
+    `fields` fields; anything shorter is a row still being written.
+    """
+    data = np.frombuffer(chunk, dtype=np.uint8)
+    quoted = np.cumsum(data == ord('"')) % 2 == 1
+    ends = np.flatnonzero((data == ord('\n')) & ~quoted)
+    end = int(ends[-1]) + 1 if len(ends) else 0
+    tail = chunk[end:]
+    if tail.strip() and not quoted[-1] and fields and _field_count(tail) >= fields:
+        end = len(chunk)
+    return end
+
+
+def _fingerprint(f, offset):
+    start = max(0, offset - FINGERPRINT_BYTES)
+    f.seek(start)
+    return zlib.crc32(f.read(offset - start))
+
+
+def _read_new_rows(path, state):
+    """Rows appended since the watermark; the whole log when it was rewritten. Returns (rows, resumed)"""
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        offset = state['offset']
+        resumed = 0 < offset <= size and _fingerprint(f, offset) == state['fingerprint']
+        start = offset if resumed else 0
+
+        f.seek(start)
+        chunk = f.read()
+        # Only consume complete records; a row still being written is picked up next run
+        fields = len(state['columns']) if resumed else _field_count(chunk.split(b'\n', 1)[0])
+        chunk = chunk[:_complete_records(chunk, fields)]
+        end = start + len(chunk)
+
+        if not chunk:
+            rows = None
+        elif resumed:
+            rows = pd.read_csv(io.BytesIO(chunk), header=None, names=state['columns'])
+        else:
+            rows = pd.read_csv(io.BytesIO(chunk))
+            state['columns'] = list(rows.columns)
+
+        state['offset'] = end
+        state['fingerprint'] = _fingerprint(f, end)
+
+    return rows, resumed
+
+
+def _aggregate(rows):
+    """Per-pairing totals and per-pairing monthly counts for a batch of session rows"""
+    rows = rows.assign(
+        Session_Date=pd.to_datetime(rows['Session_Date'], errors='coerce'),
+        Duration_Minutes=pd.to_numeric(rows['Duration_Minutes'], errors='coerce'),
+    )
+    pairings = rows.groupby(PAIR_KEYS).agg(
+        Sessions=('Session_Date', 'size'),
+        Total_Minutes=('Duration_Minutes', 'sum'),
+        Timed_Sessions=('Duration_Minutes', 'count'),
+        First_Session=('Session_Date', 'min'),
+        Last_Session=('Session_Date', 'max'),
+    )
+    monthly = rows.assign(Month=rows['Session_Date'].dt.to_period('M')).groupby(PAIR_KEYS + ['Month']).size()
+    return pairings, monthly.to_frame('Sessions')
+
+
+def _fold(old, new, agg):
+    """Combine two partial rollups; cost depends on the number of groups, not sessions"""
+    if old.empty:
+        return new
+    return pd.concat([old, new]).groupby(level=list(old.index.names)).agg(agg)
+
+
+def update_session_rollups(data_dir=DATA_DIR):
+    """Fold session notes appended since the last run into the persisted rollups"""
+    # Two writers folding the same rows would double-count them and log their events twice
+    with _state_lock(data_dir):
+        state = load_state(data_dir)
+        rows, resumed = _read_new_rows(table_path('session_notes', data_dir), state)
+
+        if not resumed:
+            fresh = _empty_state()
+            fresh.update(offset=state['offset'], fingerprint=state['fingerprint'], columns=state['columns'])
+            state = fresh
+
+        if rows is not None and len(rows) > 0:
+            if resumed:
+                # Rows past the watermark are newly uploaded notes; a full rebuild is history, not news
+                append_events(session_note_events(rows), data_dir)
+            pairings, monthly = _aggregate(rows)
+            state['pairings'] = _fold(state['pairings'], pairings, PAIRING_AGG)
+            state['monthly'] = _fold(state['monthly'], monthly, {'Sessions': 'sum'})
+
+        _save_state(state, data_dir)
+    return state
+
+
+def _add_rates(rollup, month_counts, as_of):
+    """Average duration, sessions per active month, sessions this month and recency"""
+    first, last = rollup['First_Session'], rollup['Last_Session']
+    active_months = (last.dt.year - first.dt.year) * 12 + (last.dt.month - first.dt.month) + 1
+
+    rollup['Avg_Duration'] = (rollup['Total_Minutes'] / rollup['Timed_Sessions'].where(rollup['Timed_Sessions'] > 0)).round(1)
+    rollup['Monthly_Cadence'] = (rollup['Sessions'] / active_months).round(1)
+    rollup['Sessions_This_Month'] = month_counts.reindex(rollup.index, fill_value=0).astype(int)
+    rollup['Days_Since_Last_Session'] = (pd.Timestamp(as_of) - rollup['Last_Session']).dt.days
+    return rollup.drop(columns=['Total_Minutes', 'Timed_Sessions'])
+
+
+def pairing_rollups(state, as_of=None):
+    """One row per mentor-mentee pair with session count, last date, average duration and cadence"""
+    as_of = as_of or date.today()
+    pairings = state['pairings'].copy()
+    if pairings.empty:
+        return pd.DataFrame(columns=PAIR_KEYS + ROLLUP_COLUMNS)
+
+    monthly = state['monthly']['Sessions']
+    this_month = monthly[monthly.index.get_level_values('Month') == pd.Period(as_of, 'M')].droplevel('Month')
+    return _add_rates(pairings, this_month, as_of).reset_index()
+
+
+def participant_months(state):
+    """Logged sessions per participant and calendar month, counting either side of a pairing"""
+    if state['pairings'].empty:
+        return pd.DataFrame(columns=['Name', 'Month', 'Sessions'])
+    monthly = state['monthly'].reset_index()
+    per_side = [monthly[[side, 'Month', 'Sessions']].rename(columns={side: 'Name'}) for side in PAIR_KEYS]
+    return pd.concat(per_side).groupby(['Name', 'Month'], as_index=False)['Sessions'].sum()
+
+
+def participant_rollups(state, as_of=None):
+    """Same rollup per participant, counting sessions on either side of a pairing"""
+    as_of = as_of or date.today()
+    pairings = state['pairings']
+    if pairings.empty:
+        return pd.DataFrame(columns=['Name'] + ROLLUP_COLUMNS)
+
+    per_side = [pairings.reset_index(level=side).rename(columns={side: 'Name'}).reset_index(drop=True)
+                for side in PAIR_KEYS]
+    participants = pd.concat(per_side, ignore_index=True).groupby('Name').agg(PAIRING_AGG)
+
+    months = participant_months(state)
+    this_month = months[months['Month'] == pd.Period(as_of, 'M')].set_index('Name')['Sessions']
+    return _add_rates(participants, this_month, as_of).reset_index()
@@ -3,6 +3,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from modules.derived_data import get_cube
 
 def show_smart_goals(data):
     """Module 3: SMART Goal Tracking"""
@@ -12,9 +13,12 @@ def show_smart_goals(data):
     # Key Metrics
     col1, col2, col3, col4 = st.columns(4)
     
-    total_goals = len(data['goals'])
-    achieved_goals = len(data['goals'][data['goals']['Status'] == 'Completed'])
-    in_progress = len(data['goals'][data['goals']['Status'] == 'Active'])
+    # Headline counts and the unsearched cohort x status chart come from the pre-aggregated goals cube
+    goals_cube = get_cube(data, 'goals')
+    status_counts = goals_cube.query('Status')['Count']
+    total_goals = int(status_counts.sum())
+    achieved_goals = int(status_counts.get('Completed', 0))
+    in_progress = int(status_counts.get('Active', 0))
     achievement_rate = round((achieved_goals / total_goals) * 100, 1) if total_goals > 0 else 0
     
     with col1:
@@ -27,7 +31,7 @@ def show_smart_goals(data):
         st.metric("In Progress", in_progress)
     
     with col4:
-        not_started = len(data['goals'][data['goals']['Status'] == 'Not Started'])
+        not_started = int(status_counts.get('Not Started', 0))
         st.metric("Not Started", not_started)
     
     st.markdown("---")
@@ -36,7 +40,7 @@ def show_smart_goals(data):
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        cohort_filter = st.selectbox("Filter by Cohort:", ["All"] + list(data['goals']['Cohort'].unique()))
+        cohort_filter = st.selectbox("Filter by Cohort:", ["All"] + goals_cube.members('Cohort'))
     
     with col2:
         status_filter = st.selectbox("Filter by Status:", ["All", "Completed", "Active", "Not Started"])
@@ -45,7 +49,7 @@ def show_smart_goals(data):
         mentee_search = st.text_input("Search Mentee:", placeholder="Enter mentee name...")
     
     # Apply filters
-    filtered_goals = data['goals'].copy()
+    filtered_goals = data['goals']
     
     if cohort_filter != "All":
         filtered_goals = filtered_goals[filtered_goals['Cohort'] == cohort_filter]
@@ -61,7 +65,14 @@ def show_smart_goals(data):
     
     with col1:
         st.subheader("📊 Goal Progress by Cohort")
-        cohort_status = filtered_goals.groupby(['Cohort', 'Status']).size().unstack(fill_value=0)
+        if mentee_search:
+            # The cube has no per-mentee cells; a name search counts the filtered rows
+            cohort_status = filtered_goals.groupby(['Cohort', 'Status']).size().unstack(fill_value=0)
+        else:
+            cohort_status = goals_cube.query(['Cohort', 'Status'], {
+                'Cohort': cohort_filter if cohort_filter != "All" else None,
+                'Status': status_filter if status_filter != "All" else None,
+            })['Count'].unstack(fill_value=0)
         fig_cohort = px.bar(
             cohort_status,
             title="Goal Status Distribution by Cohort",
@@ -112,7 +123,7 @@ def show_smart_goals(data):
         else:
             return 'background-color: #6B7280; color: white'
     
-    display_df = filtered_goals[['Mentee', 'Cohort', 'Date', 'SMART_Goal', 'Progress', 'Status', 'Mentor']].copy()
+    display_df = filtered_goals[['Mentee', 'Cohort', 'Date', 'SMART_Goal', 'Progress', 'Status', 'Mentor']]
     styled_df = display_df.style.applymap(style_status, subset=['Status'])
     
     st.dataframe(styled_df, use_container_width=True)
@@ -0,0 +1,140 @@
+"""SQLite storage backend - the same tables as the CSV directory, in one indexed database file
+
+The database is kept in sync with the CSVs: a table is re-imported only when its CSV
+changed. Call sync_database() once per data version before reading (the app does this
+behind a cache keyed on the CSV signatures); connections use WAL and a busy timeout so
+sessions and the warm-up CLI can read while another process syncs. SQLData.select()
+pushes row filters (e.g. the directory's role and location) down to indexed queries;
+the cached derived tables and cubes are still built from whole tables.
+"""
+import os
+import sqlite3
+from contextlib import closing
+import numpy as np
+import pandas as pd
+from modules.data_cache import DATA_DIR, TABLES, LazyData, read_table, table_signature
+from modules.participants import CATEGORICAL_COLUMNS as PARTICIPANT_CATEGORIES, build_participants
+from modules.cohorts import add_cohorts
+
+DB_FILE = 'mentorship.db'
+# How long a connection waits for another writer before failing with "database is locked"
+BUSY_TIMEOUT_MS = 30000
+# Bump when the stored tables change shape, so existing databases are re-imported once
+SCHEMA_VERSION = 2
+# Columns indexed wherever a table has them
+INDEXED_COLUMNS = ['Name', 'Participant_Name', 'Mentor', 'Mentee', 'Mentor_Name', 'Mentee_Name',
+                   'Cohort', 'Role', 'Location', 'Email', 'Participant_ID']
+
+# Tables materialized from others: name -> (source tables, builder(tables, data_dir), categorical columns)
+DERIVED_TABLES = {
+    'participants': (('mentors_real_data', 'mentees_real_data', 'enhanced_engagement'),
+                     lambda t, data_dir: add_cohorts(build_participants(t['mentors_real_data'], t['mentees_real_data']),
+                                                     t['enhanced_engagement'], data_dir),
+                     PARTICIPANT_CATEGORIES + ['Cohort']),
+}
+
+
+def db_path(data_dir=DATA_DIR):
+    return os.path.join(data_dir, DB_FILE)
+
+
+def _connect(data_dir):
+    conn = sqlite3.connect(db_path(data_dir), timeout=BUSY_TIMEOUT_MS / 1000)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    # Readers never block on the writer of a sync, and vice versa
+    conn.execute("PRAGMA journal_mode = WAL")
+    return closing(conn)
+
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _version(names, data_dir):
+    return repr([SCHEMA_VERSION] + [table_signature(name, data_dir) for name in names])
+
+
+def _plain(column):
+    """Numeric categoricals as plain numbers, so SQLite compares them as numbers and not as text"""
+    if isinstance(column.dtype, pd.CategoricalDtype) and pd.api.types.is_numeric_dtype(column.cat.categories):
+        return column.astype(column.cat.categories.dtype if column.notna().all() else 'float64')
+    return column
+
+
+def _store(conn, name, df):
+    df.apply(_plain).to_sql(name, conn, if_exists='replace', index=False)
+    for column in INDEXED_COLUMNS:
+        if column in df.columns:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{name}_{column}')} "
+                         f"ON {_quote(name)} ({_quote(column)})")
+
+
+def sync_database(data_dir=DATA_DIR):
+    """Import every table whose CSV changed since the last sync, and rebuild derived tables"""
+    with _connect(data_dir) as conn, conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS _versions (name TEXT PRIMARY KEY, version TEXT)")
+        stored = dict(conn.execute("SELECT name, version FROM _versions"))
+
+        tables = {}
+        sources = [(name, (name,)) for name in TABLES] + [(name, spec[0]) for name, spec in DERIVED_TABLES.items()]
+        for name, source_names in sources:
+            version = _version(source_names, data_dir)
+            if stored.get(name) == version:
+                continue
+            if name in DERIVED_TABLES:
+                df = DERIVED_TABLES[name][1]({s: tables[s] if s in tables else read_table(s, data_dir)
+                                              for s in source_names}, data_dir)
+            else:
+                df = tables[name] = read_table(name, data_dir)
+            _store(conn, name, df)
+            conn.execute("INSERT OR REPLACE INTO _versions VALUES (?, ?)", (name, version))
+
+
+def read_sql_table(name, data_dir=DATA_DIR):
+    """Whole table from the database"""
+    with _connect(data_dir) as conn:
+        df = pd.read_sql(f"SELECT * FROM {_quote(name)}", conn)
+    return _restore_types(name, df)
+
+
+def _restore_types(name, df):
+    if name in DERIVED_TABLES:
+        for column in DERIVED_TABLES[name][2]:
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+    return df
+
+
+def _param(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class SQLData(LazyData):
+    """LazyData over a synced SQLite database (see sync_database), with filter pushdown through select()"""
+
+    supports_queries = True
+
+    def select(self, name, equals=None, contains=None, columns=None, order_by=None, limit=None):
+        """Rows of a table matching every equals {column: value} filter (None = no filter)
+        and, when contains=(columns, text) is given, containing text in any of those columns"""
+        clauses, params = [], []
+        for column, value in (equals or {}).items():
+            if value is not None:
+                clauses.append(f"{_quote(column)} = ?")
+                params.append(_param(value))
+        if contains and contains[1]:
+            text = contains[1].replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append('(' + ' OR '.join(f"{_quote(c)} LIKE ? ESCAPE '\\'" for c in contains[0]) + ')')
+            params.extend([f"%{text}%"] * len(contains[0]))
+
+        sql = f"SELECT {', '.join(map(_quote, columns)) if columns else '*'} FROM {_quote(name)}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order_by:
+            sql += f" ORDER BY {_quote(order_by)}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with _connect(self._data_dir) as conn:
+            df = pd.read_sql(sql, conn, params=params)
+        return _restore_types(name, df)
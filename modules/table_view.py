@@ -0,0 +1,41 @@
+import math
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def page_slice(frame, page, page_size, sort_by=None, ascending=True):
+    """One page of frame, sorted server-side; page numbers start at 1"""
+    if sort_by:
+        frame = frame.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last')
+    start = (page - 1) * page_size
+    return frame.iloc[start:start + page_size]
+
+
+def cell_styles(frame, column_styles):
+    """CSS for every cell, looked up per column from {column: {value: css}} without per-cell callbacks"""
+    styles = frame.apply(lambda column: column.astype(object).map(column_styles.get(column.name, {})))
+    return styles.fillna('')
+
+
+def show_paginated_table(frame, key, column_styles=None):
+    """Render frame a page at a time, styling only the visible rows"""
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+    with col1:
+        sort_by = st.selectbox("Sort by:", list(frame.columns), key=f"{key}_sort")
+    with col2:
+        order = st.selectbox("Order:", ["Ascending", "Descending"], key=f"{key}_order")
+    with col3:
+        page_size = st.selectbox("Rows per page:", PAGE_SIZES, key=f"{key}_page_size")
+    page_count = max(1, math.ceil(len(frame) / page_size))
+    # Filters can shrink the table below the page the user was on
+    if st.session_state.get(f"{key}_page", 1) > page_count:
+        st.session_state[f"{key}_page"] = page_count
+    with col4:
+        page = st.number_input("Page:", min_value=1, max_value=page_count, step=1, key=f"{key}_page")
+
+    visible = page_slice(frame, page, page_size, sort_by, order == "Ascending")
+    if column_styles:
+        visible = visible.style.apply(cell_styles, column_styles=column_styles, axis=None)
+    st.dataframe(visible, use_container_width=True, hide_index=True)
+    st.caption(f"Page {page} of {page_count} · {len(frame)} rows")
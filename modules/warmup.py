@@ -0,0 +1,66 @@
+"""Pre-populate the on-disk caches so the first app start after a deploy is fast
+
+Run from the project root after new data or a new release is deployed:
+
+    python -m modules.warmup [--storage sqlite]
+
+This writes the columnar cache of every CSV (data/.cache), the session-notes rollup
+state, the persisted cohorts and mentor assignment, and with --storage sqlite the
+synced database. The app then only reads these files. No Streamlit import is needed;
+the app warms its in-memory caches itself while the login page is shown.
+"""
+import argparse
+import os
+import time
+from modules.cohorts import add_cohorts
+from modules.data_cache import DATA_DIR, TABLES, read_table
+from modules.matching import assign_mentors, load_assignments, save_assignments
+from modules.participants import build_participants
+from modules.session_rollups import update_session_rollups
+from modules.sql_store import sync_database
+
+STORAGE_BACKENDS = ('csv', 'sqlite')
+
+
+def warm_disk_caches(data_dir=DATA_DIR, storage='csv'):
+    """Build every on-disk cache that is missing or stale; returns seconds per step"""
+    timings = {}
+
+    def step(name, build):
+        start = time.perf_counter()
+        result = build()
+        timings[name] = round(time.perf_counter() - start, 3)
+        return result
+
+    tables = step('tables', lambda: {name: read_table(name, data_dir) for name in TABLES})
+    step('session rollups', lambda: update_session_rollups(data_dir))
+    participants = step('cohorts', lambda: add_cohorts(
+        build_participants(tables['mentors_real_data'], tables['mentees_real_data']),
+        tables['enhanced_engagement'], data_dir))
+
+    def assignments():
+        # load_assignments returns None once one of its source CSVs changed
+        if load_assignments(data_dir) is None:
+            save_assignments(assign_mentors(participants), data_dir)
+    step('assignments', assignments)
+
+    if storage == 'sqlite':
+        step('sqlite sync', lambda: sync_database(data_dir))
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-populate the on-disk caches of the mentorship dashboard")
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--storage', choices=STORAGE_BACKENDS,
+                        default=os.environ.get('MENTORSHIP_STORAGE', 'csv'))
+    args = parser.parse_args(argv)
+
+    timings = warm_disk_caches(args.data_dir, args.storage)
+    for name, seconds in timings.items():
+        print(f"{name:<16} {seconds:>8.3f}s")
+    print(f"caches in {args.data_dir} are warm ({sum(timings.values()):.3f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+import shutil
+import pytest
+from modules import derived_data
+from modules.cohorts import add_cohorts
+from modules.data_cache import DATA_DIR, TABLES, LazyData, read_table
+from modules.sql_store import SQLData, read_sql_table, sync_database
+
+
+@pytest.fixture(scope='session')
+def data_dir(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp('data')
+    for file_name in TABLES.values():
+        shutil.copy(f"{DATA_DIR}/{file_name}", data_dir / file_name)
+    sync_database(data_dir)
+    return data_dir
+
+
+@pytest.fixture
+def backends(data_dir, monkeypatch):
+    # Cohorts are persisted in the copy, not in the repository's data directory
+    monkeypatch.setattr(derived_data, 'add_cohorts', lambda participants, engagement: add_cohorts(participants, engagement, data_dir))
+    return (LazyData(lambda name, signature: read_table(name, data_dir), data_dir),
+            SQLData(lambda name, signature: read_sql_table(name, data_dir), data_dir))
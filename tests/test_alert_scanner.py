@@ -0,0 +1,47 @@
+import pandas as pd
+from modules.alert_scanner import alert_records, current_alerts, diff_alerts, rekey_snapshot
+from modules.alerts import ENGAGEMENT_RULES, evaluate_rules
+
+
+def alerts_for(facts):
+    return evaluate_rules(facts, ENGAGEMENT_RULES).assign(Source='engagement').astype(object)
+
+
+def test_participants_sharing_a_name_keep_separate_alerts():
+    facts = pd.DataFrame({
+        'Name': ['Sara Ali', 'Sara Ali', 'Omar'],
+        'Email': ['sara.ali@nesma.com', 'sara.ali2@nesma.com', None],
+        'Role': ['Mentee', 'Mentee', 'Mentor'],
+        'Cohort': [1, 2, 1],
+        'Goal_Progress': [40, 30, 20],
+    })
+    records = alert_records(alerts_for(facts))
+
+    assert [r['key'] for r in records] == [
+        'engagement:low_goal_progress:sara.ali@nesma.com',
+        'engagement:low_goal_progress:sara.ali2@nesma.com',
+        'engagement:low_goal_progress:Mentor:Omar',
+    ]
+    assert [r['name'] for r in records] == ['Sara Ali', 'Sara Ali', 'Omar']
+
+
+def test_name_keyed_snapshots_are_carried_over():
+    facts = pd.DataFrame({'Name': ['Ada', 'Sara', 'Sara'], 'Email': ['ada@x.com', 's1@x.com', 's2@x.com'],
+                          'Role': ['Mentee'] * 3, 'Cohort': [1, 1, 2], 'Goal_Progress': [40, 30, 20]})
+    current = {r['key']: r for r in alert_records(alerts_for(facts))}
+    # Written before alerts had a source and email: keyed by name, so the two Saras collapse into one
+    legacy = {f"engagement:low_goal_progress:{r['name']}": {k: v for k, v in r.items() if k not in ('source', 'email')}
+              for r in current.values()}
+
+    events = diff_alerts(rekey_snapshot(legacy, current), current)
+    # Ada's alert is matched by name; the shared name cannot be told apart, so Sara's are re-announced
+    assert sorted((e['event'], e['name'], e.get('email')) for e in events) == [
+        ('new', 'Sara', 's1@x.com'), ('new', 'Sara', 's2@x.com'), ('resolved', 'Sara', None)]
+    assert rekey_snapshot(current, current) == current
+
+
+def test_scan_keys_every_alert_by_participant(data_dir):
+    records = current_alerts(str(data_dir))
+    keys = [r['key'] for r in records]
+    assert records and len(keys) == len(set(keys))
+    assert all(r['email'] for r in records if r['source'] == 'engagement')
@@ -0,0 +1,27 @@
+import pandas as pd
+from modules.alerts import ALERT_COLUMNS, ENGAGEMENT_RULES, SCORECARD_RULES, evaluate_rules
+
+
+def test_rules_fire_per_participant_most_severe_first():
+    facts = pd.DataFrame({
+        'Name': ['Ada', 'Alan', 'Grace'],
+        'Role': ['Mentee', 'Mentee', 'Mentor'],
+        'Cohort': [1, 2, 1],
+        'Risk_Flag': ['', 'No session in 30 days', ''],
+        'Engagement_Status': ['Active', 'At Risk', 'Active'],
+        'Goal_Progress': [40, None, 90],
+        'Mentee_Satisfaction': [4.5, 3.0, None],
+    })
+    alerts = evaluate_rules(facts, ENGAGEMENT_RULES)
+
+    assert list(alerts.columns) == ALERT_COLUMNS
+    assert list(zip(alerts['Name'], alerts['Rule'])) == [
+        ('Alan', 'no_recent_session'), ('Alan', 'low_engagement'), ('Ada', 'low_goal_progress'),
+        ('Alan', 'low_satisfaction')]
+    assert alerts.loc[2, 'Reason'] == 'Goal progress: 40.0%'
+
+
+def test_missing_columns_and_no_matches_give_an_empty_frame():
+    alerts = evaluate_rules(pd.DataFrame({'Name': ['Ada'], 'Flag': ['Green'], 'Engagement_Score': [9]}), SCORECARD_RULES)
+    assert alerts.empty and list(alerts.columns) == ALERT_COLUMNS
+    assert evaluate_rules(pd.DataFrame({'Name': ['Ada']}), ENGAGEMENT_RULES).empty
@@ -0,0 +1,42 @@
+import pandas as pd
+from modules.cohorts import COHORT_COUNT, add_cohorts, load_cohorts
+
+PARTICIPANTS = pd.DataFrame({
+    'Participant_ID': [f"{i:03d}" for i in range(10)],
+    'Name': [f"Person {i}" for i in range(9)] + ['Person 3'],
+    'Role': ['Mentor'] * 2 + ['Mentee'] * 8,
+})
+NO_RECORDS = pd.DataFrame(columns=['Participant_Name', 'Role', 'Cohort'])
+
+
+def cohorts(frame):
+    return frame['Cohort'].astype(int).tolist()
+
+
+def test_cohorts_are_balanced_per_role_and_kept(tmp_path):
+    first = add_cohorts(PARTICIPANTS, NO_RECORDS, tmp_path)
+    assert cohorts(first) == [1, 2, 1, 2, 3, 4, 1, 2, 3, 4]
+    assert list(first['Cohort'].cat.categories) == list(range(1, COHORT_COUNT + 1))
+
+    # A newcomer joins the smallest cohort of their role; everyone else keeps theirs
+    newcomer = pd.DataFrame({'Participant_ID': ['100'], 'Name': ['New'], 'Role': ['Mentee']})
+    second = add_cohorts(pd.concat([PARTICIPANTS, newcomer], ignore_index=True), NO_RECORDS, tmp_path)
+    assert cohorts(second) == cohorts(first) + [1]
+    assert len(load_cohorts(tmp_path)) == 11
+
+
+def test_recorded_cohorts_win_where_the_name_is_unambiguous(tmp_path):
+    add_cohorts(PARTICIPANTS, NO_RECORDS, tmp_path)
+    records = pd.DataFrame({
+        'Participant_Name': ['Person 2', 'Person 0', 'Person 1', 'Person 3', 'Person 4'],
+        'Role': ['Mentee', 'Mentor', 'Mentor', 'Mentee', 'Mentee'],
+        'Cohort': [4, 3, 9, 1, 'n/a'],
+    })
+    result = add_cohorts(PARTICIPANTS, records, tmp_path)
+
+    assert result.loc[2, 'Cohort'] == 4  # recorded
+    assert result.loc[0, 'Cohort'] == 3  # recorded
+    assert result.loc[1, 'Cohort'] == 2  # cohort 9 is out of range
+    assert result.loc[3, 'Cohort'] == 2  # two mentees are called 'Person 3'
+    assert result.loc[4, 'Cohort'] == 3  # not a number
+    assert load_cohorts(tmp_path).loc[2, 'Cohort'] == 4
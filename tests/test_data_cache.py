@@ -0,0 +1,48 @@
+import os
+import pytest
+from modules.data_cache import CACHE_DIR, LazyData, read_table, table_signature
+
+
+def write_csv(data_dir, name, text, mtime_ns):
+    path = os.path.join(data_dir, name)
+    with open(path, 'w') as f:
+        f.write(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_read_table_reparses_a_changed_csv(tmp_path):
+    write_csv(tmp_path, 'mentors.csv', "Name,Score\nAda,1\n", 1_000_000_000)
+    assert read_table('mentors', tmp_path)['Score'].tolist() == [1]
+    assert read_table('mentors', tmp_path)['Score'].tolist() == [1]  # served from the columnar cache
+
+    write_csv(tmp_path, 'mentors.csv', "Name,Score\nAda,2\n", 2_000_000_000)
+    assert read_table('mentors', tmp_path)['Score'].tolist() == [2]
+    # The entry of the old version is replaced, not kept next to the new one
+    assert len(os.listdir(tmp_path / CACHE_DIR)) == 1
+
+
+def test_lazy_data_keys_the_loader_on_the_csv_version(tmp_path):
+    write_csv(tmp_path, 'mentors.csv', "Name\nAda\n", 1_000_000_000)
+    calls = []
+
+    def loader(name, signature):
+        calls.append((name, signature))
+        return read_table(name, tmp_path)
+
+    data = LazyData(loader, tmp_path)
+    data['mentors']
+    data['mentors']
+    assert calls == [('mentors', table_signature('mentors', tmp_path))]
+    before = data.signature('mentors')
+
+    write_csv(tmp_path, 'mentors.csv', "Name\nAda\nGrace\n", 2_000_000_000)
+    assert len(LazyData(loader, tmp_path)['mentors']) == 2
+    assert calls[-1][1] != calls[0][1]
+    assert LazyData(loader, tmp_path).signature('mentors') != before
+
+
+def test_lazy_data_only_serves_known_tables(tmp_path):
+    data = LazyData(lambda name, signature: None, tmp_path)
+    assert 'mentors' in data and 'unknown' not in data
+    with pytest.raises(KeyError):
+        data['unknown']
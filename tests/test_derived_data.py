@@ -0,0 +1,14 @@
+from modules import derived_data
+from modules.derived_data import PAGE_DATA, search_participants
+from modules.search_index import SearchIndex
+
+
+def test_the_prefetched_search_index_is_the_one_the_directory_reads(backends, monkeypatch):
+    csv_data, _ = backends
+    built = []
+    monkeypatch.setattr(derived_data, 'SearchIndex', lambda frame: built.append(frame) or SearchIndex(frame))
+    derived_data._search_index.clear()
+
+    PAGE_DATA['mentor_eligibility']['search index'](csv_data)
+    search_participants(csv_data, 'mo')
+    assert len(built) == 1
@@ -0,0 +1,42 @@
+import pandas as pd
+from modules.data_cache import CACHE_DIR
+from modules.event_log import (INDEX_FILE, append_events, collect_goal_events, events_between, events_since,
+                               latest_events)
+
+
+def messages(events):
+    return [event['message'] for event in events]
+
+
+def test_latest_events_and_tailing_from_the_cursor(tmp_path):
+    append_events([{'type': 'Goal', 'message': str(i)} for i in range(5)], tmp_path)
+    events, cursor = latest_events(3, tmp_path)
+    assert messages(events) == ['4', '3', '2']
+
+    assert events_since(cursor, tmp_path) == ([], cursor)
+    append_events([{'type': 'Goal', 'message': '5'}], tmp_path)
+    events, _ = events_since(cursor, tmp_path)
+    assert messages(events) == ['5']
+
+
+def test_events_between_uses_the_timestamps(tmp_path):
+    append_events([{'type': 'Goal', 'message': 'a'}, {'type': 'Goal', 'message': 'b'}], tmp_path)
+    first, second = latest_events(2, tmp_path)[0][::-1]
+    assert messages(events_between(pd.Timestamp(second['ts']), data_dir=tmp_path)) == ['b']
+    assert messages(events_between(pd.Timestamp(first['ts']), pd.Timestamp(second['ts']), tmp_path)) == ['a']
+
+
+def test_a_missing_index_is_rebuilt_from_the_log(tmp_path):
+    append_events([{'type': 'Goal', 'message': 'a'}], tmp_path)
+    (tmp_path / CACHE_DIR / INDEX_FILE).unlink()
+    append_events([{'type': 'Goal', 'message': 'b'}], tmp_path)
+    assert messages(latest_events(5, tmp_path)[0]) == ['b', 'a']
+
+
+def test_goal_completions_are_logged_once(tmp_path):
+    goals = pd.DataFrame({'Mentee': ['Ada', 'Alan'], 'SMART_Goal': ['Lead', 'Speak'], 'Status': ['Completed', 'Active']})
+    assert len(collect_goal_events(goals, tmp_path)) == 1
+    assert collect_goal_events(goals, tmp_path) == []
+
+    goals.loc[1, 'Status'] = 'Completed'
+    assert messages(collect_goal_events(goals, tmp_path)) == ['Mentee Alan completed a goal: Speak']
@@ -0,0 +1,31 @@
+import numpy as np
+import plotly.express as px
+import plotly.io as pio
+from modules.figure_cache import FigureCache, estimate_size, figure_key
+
+
+def test_estimated_size_tracks_the_serialized_size():
+    figure = px.scatter(x=np.arange(20000), y=np.random.default_rng(0).random(20000))
+    actual = len(pio.to_json(figure, validate=False))
+    assert 0.5 * actual < estimate_size(figure) < 2 * actual
+
+
+def test_builds_once_per_key_and_evicts_least_recently_used():
+    cache = FigureCache(max_entries=2)
+    builds = []
+
+    def build(n):
+        builds.append(n)
+        return px.bar(x=['a'], y=[n])
+
+    for n in (1, 1, 2, 1, 3, 2):
+        cache.get_or_build(figure_key('chart', 'v1', n=n), lambda: build(n))
+    assert builds == [1, 2, 3, 2]  # 2 was the least recently used when 3 arrived
+    assert (cache.hits, len(cache)) == (2, 2)
+
+
+def test_over_budget_figures_are_returned_but_not_kept():
+    cache = FigureCache(max_bytes=1024)
+    figure = px.bar(x=['a'], y=[1])
+    assert cache.put(figure_key('chart', 'v1'), figure) is figure
+    assert len(cache) == 0 and cache.size == 0
@@ -0,0 +1,53 @@
+import pytest
+from modules import derived_data
+from modules.derived_data import filter_participants, get_participants, select_rows
+from modules.search_index import SEARCH_FIELDS
+
+
+def rows(frame):
+    return list(zip(frame['Participant_ID'], frame['Role'].astype(str), frame['Location'].astype(str),
+                    frame['Cohort'].astype(int)))
+
+
+def fresh(call, data):
+    # Both backends share a data version, so the shared caches are cleared to compare real reads
+    derived_data._participants.clear()
+    derived_data._search_index.clear()
+    return call(data)
+
+
+@pytest.mark.parametrize('role', [None, 'Mentor', 'Mentee'])
+@pytest.mark.parametrize('location', [None, 'Riyadh', 'Jeddah'])
+@pytest.mark.parametrize('cohort', [None, 2])
+def test_directory_filters_return_the_same_rows(backends, role, location, cohort):
+    csv_data, sql_data = backends
+    expected = fresh(lambda d: filter_participants(d, role, location, cohort=cohort), csv_data)
+    assert rows(fresh(lambda d: filter_participants(d, role, location, cohort=cohort), sql_data)) == rows(expected)
+
+
+@pytest.mark.parametrize('role', [None, 'Mentee'])
+@pytest.mark.parametrize('search', ['mo', 'a', 'mohamed', 'GMAIL', '184'])
+def test_directory_search_is_a_substring_match_on_sqlite(backends, role, search):
+    csv_data, sql_data = backends
+    participants = fresh(get_participants, csv_data)
+    haystack = participants[list(SEARCH_FIELDS)].astype(str).apply(lambda c: c.str.lower()).agg(' '.join, axis=1)
+    expected = participants[haystack.str.contains(search.lower(), regex=False)]
+    if role is not None:
+        expected = expected[expected['Role'] == role]
+    actual = fresh(lambda d: filter_participants(d, role, search=search), sql_data)
+    assert sorted(rows(actual)) == sorted(rows(expected))
+    # The CSV backend's ranked index returns every substring match too, plus fuzzy ones
+    ranked = fresh(lambda d: filter_participants(d, role, search=search), csv_data)
+    assert set(rows(actual)) <= set(rows(ranked))
+
+
+@pytest.mark.parametrize('equals, contains', [
+    ({'Status': 'Active'}, None),
+    (None, (['Mentor', 'Mentee'], 'ah')),
+    ({'Status': None}, (['Mentee'], '%')),
+])
+def test_select_rows_pushdown_matches_pandas(backends, equals, contains):
+    csv_data, sql_data = backends
+    expected = select_rows(csv_data, 'pairings', equals, contains)
+    actual = select_rows(sql_data, 'pairings', equals, contains)
+    assert actual['Mentee'].tolist() == expected['Mentee'].tolist()
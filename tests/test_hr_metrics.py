@@ -0,0 +1,51 @@
+import pandas as pd
+from modules.hr_metrics import build_metrics_cube, metrics_from_cube, window_months
+
+FACTS = pd.DataFrame({
+    'Name': ['Ada', 'Alan', 'Grace'],
+    'Cohort': pd.array([1, 1, 2], dtype='Int64'),
+    'Role': ['Mentor', 'Mentee', 'Mentee'],
+    'Engagement_Status': ['Active', 'Active', 'At Risk'],
+    'Risk_Flag': ['', '', 'Goals not updated'],
+    'Last_Session_Date': pd.to_datetime(['2025-08-10', '2025-08-12', '2025-03-01']),
+    'Total_Sessions': [30, 20, None],
+    'Mentor_Satisfaction': [4.0, None, None],
+    'Mentee_Satisfaction': [None, 4.5, 3.0],
+    'Goal_Progress': [None, 95, 40],
+})
+# Ada and Alan met twice in July and once in August; Grace's sessions were long ago
+SESSION_MONTHS = pd.DataFrame({
+    'Month': pd.PeriodIndex(['2025-07', '2025-08', '2025-07', '2025-08', '2025-01'], freq='M'),
+    'Cohort': pd.array([1, 1, 1, 1, 2], dtype='Int64'),
+    'Role': ['Mentor', 'Mentor', 'Mentee', 'Mentee', 'Mentee'],
+    'Sessions': [2, 1, 2, 1, 5],
+})
+
+
+def metrics(timeframe, cohort=None):
+    cube = build_metrics_cube(FACTS, SESSION_MONTHS)
+    return metrics_from_cube(cube, FACTS, window_months(timeframe, pd.Timestamp('2025-08-20')), cohort)
+
+
+def test_all_time_uses_the_recorded_totals():
+    all_time = metrics('All Time')
+    assert (all_time.total_participants, all_time.total_sessions) == (3, 50)
+    assert (all_time.avg_mentor_sessions, all_time.avg_mentee_sessions) == (30, 20)
+    assert all_time.mentee_satisfaction == 3.8
+    assert all_time.completion_rate == 50
+
+
+def test_windows_count_only_the_sessions_logged_in_their_months():
+    this_month = metrics('This Month')
+    assert (this_month.total_participants, this_month.total_sessions) == (2, 2)
+    assert (this_month.avg_mentor_sessions, this_month.avg_mentee_sessions) == (1, 1)
+
+    last_three = metrics('Last 3 Months')
+    assert (last_three.total_sessions, last_three.avg_mentor_sessions) == (6, 3)
+    assert metrics('Last 3 Months', cohort=2).total_sessions == 0
+
+
+def test_cohort_filter_on_the_cube_matches_the_rows():
+    cohort_two = metrics('All Time', cohort=2)
+    assert (cohort_two.mentees_count, cohort_two.mentors_count) == (1, 0)
+    assert list(cohort_two.at_risk['Name']) == ['Grace']
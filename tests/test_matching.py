@@ -0,0 +1,53 @@
+import math
+import os
+import pandas as pd
+from modules.matching import ASSIGNMENT_COLUMNS, assign_mentors, load_assignments, save_assignments
+
+
+def roster(mentor_locations, mentee_locations):
+    rows = [(f"M{i:03d}", f"Mentor {i:03d}", 'Mentor', loc) for i, loc in enumerate(mentor_locations)]
+    rows += [(f"E{i:03d}", f"Mentee {i:03d}", 'Mentee', loc) for i, loc in enumerate(mentee_locations)]
+    return pd.DataFrame(rows, columns=['Participant_ID', 'Name', 'Role', 'Location'])
+
+
+def test_default_capacity_matches_every_mentee_evenly():
+    participants = roster(['Riyadh'] * 3 + ['Jeddah'] * 2, ['Riyadh'] * 10 + ['Jeddah'] * 2 + [None] * 4)
+    assignments = assign_mentors(participants)
+
+    assert list(assignments.columns) == ASSIGNMENT_COLUMNS
+    assert sorted(assignments['Mentee_ID']) == sorted(participants.loc[participants['Role'] == 'Mentee', 'Participant_ID'])
+    assert assignments['Mentor_ID'].value_counts().max() <= math.ceil(16 / 5)
+
+
+def test_explicit_capacity_is_never_exceeded():
+    participants = roster(['Riyadh'] * 2, ['Riyadh'] * 9)
+    assignments = assign_mentors(participants, capacity=3)
+
+    assert len(assignments) == 6  # the rest stay unassigned
+    assert assignments['Mentor_ID'].value_counts().max() == 3
+    assert assignments['Mentee_ID'].is_unique
+
+
+def test_local_mentors_are_filled_before_remote_ones():
+    participants = roster(['Riyadh', 'Jeddah'], ['Riyadh', 'Riyadh', 'Jeddah', 'Tabuk'])
+    assignments = assign_mentors(participants, capacity=2).set_index('Mentee_ID')
+
+    assert assignments.loc[['E000', 'E001', 'E002'], 'Same_Location'].all()
+    assert not assignments.loc['E003', 'Same_Location']
+    assert assignments.loc['E002', 'Mentor_ID'] == 'M001'
+
+
+def test_no_mentors_gives_an_empty_assignment():
+    assert assign_mentors(roster([], ['Riyadh'])).empty
+
+
+def test_saved_assignment_is_reused_until_a_roster_changes(tmp_path):
+    for name in ('mentors_real_data', 'mentees_real_data'):
+        (tmp_path / f"{name}.csv").write_text("x\n")
+    assignments = assign_mentors(roster(['Riyadh'], ['Riyadh']))
+    save_assignments(assignments, tmp_path)
+    pd.testing.assert_frame_equal(load_assignments(tmp_path), assignments.astype({'Mentor_ID': 'string', 'Mentee_ID': 'string'}))
+
+    later = (tmp_path / 'assignments.csv').stat().st_mtime_ns + 1_000_000_000
+    os.utime(tmp_path / 'mentees_real_data.csv', ns=(later, later))
+    assert load_assignments(tmp_path) is None
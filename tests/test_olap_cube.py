@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+from modules.olap_cube import Cube
+
+ROWS = pd.DataFrame({
+    'Cohort': [1, 1, 2, 2, 2, None],
+    'Status': ['Active', 'Done', 'Active', 'Active', 'Done', 'Active'],
+    'Score': [10, 20, 30, 40, 50, 60],
+})
+
+
+def test_queries_match_the_raw_rows():
+    cube = Cube(ROWS, ['Cohort', 'Status'], ['Score'])
+
+    assert cube.counts('Status').to_dict() == ROWS['Status'].value_counts().to_dict()
+    active = ROWS[ROWS['Status'] == 'Active']
+    assert cube.query('Cohort', {'Status': 'Active'})['Score'].to_dict() == active.groupby('Cohort')['Score'].sum().to_dict()
+    assert cube.counts('Status', {'Cohort': [1, 2]}).to_dict() == {'Active': 3, 'Done': 2}
+    assert cube.means('Cohort')['Score'].to_dict() == {1.0: 15.0, 2.0: 40.0}
+
+
+def test_members_and_missing_dimensions():
+    cube = Cube(ROWS, ['Cohort', 'Department'])
+    assert cube.dimensions == ['Cohort']
+    assert cube.members('Cohort') == [1, 2]
+    with pytest.raises(ValueError):
+        Cube(ROWS, ['Department'])
@@ -0,0 +1,39 @@
+import json
+import pytest
+from modules.profiler import Profiler
+
+
+def logged(path):
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def test_a_run_is_logged_when_its_page_raises(tmp_path):
+    profiler = Profiler('time', tmp_path / 'profile.jsonl')
+    with pytest.raises(ValueError):
+        with profiler.run('hr_dashboard'), profiler.span('page'):
+            raise ValueError
+    with profiler.run('hr_dashboard'), profiler.span('data load'):
+        pass
+
+    runs = logged(tmp_path / 'profile.jsonl')
+    # The second run starts clean instead of inheriting the spans of the failed one
+    assert [[span['name'] for span in run['spans']] for run in runs] == [['page'], ['data load']]
+
+
+def test_a_fragment_inside_a_run_adds_to_it_and_on_its_own_is_a_run(tmp_path):
+    profiler = Profiler('time', tmp_path / 'profile.jsonl')
+    with profiler.run('mentor_eligibility'):
+        with profiler.run('Directory: participants'), profiler.span('Directory: participants'):
+            pass
+    with profiler.run('Directory: participants'), profiler.span('Directory: participants'):
+        pass
+
+    assert [run['page'] for run in logged(tmp_path / 'profile.jsonl')] == ['mentor_eligibility', 'Directory: participants']
+    assert len(profiler.durations('Directory: participants')) == 2
+
+
+def test_nothing_is_recorded_while_off(tmp_path):
+    profiler = Profiler('off', tmp_path / 'profile.jsonl')
+    with profiler.run('hr_dashboard'), profiler.span('page'):
+        pass
+    assert logged(tmp_path / 'profile.jsonl') == [] and profiler.summary().empty
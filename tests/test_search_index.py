@@ -0,0 +1,49 @@
+import pandas as pd
+from modules.search_index import SearchIndex, normalize
+
+PEOPLE = pd.DataFrame({
+    'Name': ['Sara Ali', 'Alisara Noor', 'Omar Alisson', 'Zoë Khan', 'Mohamed Salah'],
+    'Email': ['sara.ali@example.com', 'anoor@example.com', 'omar@example.com', 'zoe@example.com', None],
+    'Participant_ID': ['101', '102', '103', '104', '105'],
+})
+
+
+def names(index, query, **kwargs):
+    return PEOPLE['Name'].iloc[index.search(query, **kwargs)].tolist()
+
+
+def test_tiers_rank_exact_then_prefix_then_substring():
+    index = SearchIndex(PEOPLE)
+    # Exact field value, then word prefixes (in row order), then a mid-word substring
+    assert names(index, 'sara ali', fuzzy=False) == ['Sara Ali']
+    assert names(index, 'ali', fuzzy=False) == ['Sara Ali', 'Alisara Noor', 'Omar Alisson']
+    assert names(index, 'sara', fuzzy=False) == ['Sara Ali', 'Alisara Noor']
+    # Fuzzy matches only come after every exact match
+    assert names(index, 'sara ali')[0] == 'Sara Ali'
+
+
+def test_matches_ids_emails_and_ignores_case_and_accents():
+    index = SearchIndex(PEOPLE)
+    assert names(index, '103') == ['Omar Alisson']
+    assert names(index, 'ANOOR@') == ['Alisara Noor']
+    assert names(index, 'zoe') == ['Zoë Khan']
+    assert normalize('  Zoë   KHAN ') == 'zoe khan'
+
+
+def test_single_character_matches_anywhere():
+    index = SearchIndex(PEOPLE)
+    assert names(index, 'k') == ['Zoë Khan']
+    assert names(index, 'h') == ['Zoë Khan', 'Mohamed Salah']
+
+
+def test_typos_fall_back_to_fuzzy_matches_after_exact_ones():
+    index = SearchIndex(PEOPLE)
+    assert names(index, 'mohamad') == ['Mohamed Salah']
+    assert names(index, 'mohamad', fuzzy=False) == []
+
+
+def test_no_match_across_fields_and_empty_query_returns_all():
+    index = SearchIndex(PEOPLE)
+    assert names(index, 'noor anoor', fuzzy=False) == []
+    assert len(index.search('')) == len(PEOPLE)
+    assert len(index.search('a', limit=2)) == 2
@@ -0,0 +1,82 @@
+import threading
+from modules.event_log import latest_events
+from modules.session_rollups import load_state, participant_months, update_session_rollups
+
+HEADER = "Session_ID,Mentor_Name,Mentee_Name,Session_Date,Duration_Minutes,Key_Takeaways\n"
+
+
+def row(i, mentor='Ada', mentee='Grace', day='2025-08-01', minutes=60, takeaway='Goals'):
+    return f'{i},{mentor},{mentee},{day},{minutes},"{takeaway}"\n'
+
+
+def write(data_dir, text, mode='a'):
+    with open(data_dir / 'session_notes.csv', mode) as f:
+        f.write(text)
+
+
+def sessions(state):
+    return state['pairings']['Sessions'].to_dict()
+
+
+def test_appended_rows_are_folded_in_from_the_watermark(tmp_path):
+    write(tmp_path, HEADER + row(1) + row(2, mentee='Alan'), 'w')
+    state = update_session_rollups(tmp_path)
+    assert sessions(state) == {('Ada', 'Alan'): 1, ('Ada', 'Grace'): 1}
+    assert latest_events(5, tmp_path)[0] == []  # the first build is history, not news
+
+    write(tmp_path, row(3) + row(4, day='2025-09-01', minutes=30))
+    state = update_session_rollups(tmp_path)
+    assert sessions(state) == {('Ada', 'Alan'): 1, ('Ada', 'Grace'): 3}
+    assert state['offset'] == (tmp_path / 'session_notes.csv').stat().st_size
+    assert len(latest_events(5, tmp_path)[0]) == 2
+
+    # Nothing new: the state is unchanged and no event is logged twice
+    assert sessions(update_session_rollups(tmp_path)) == sessions(state)
+    assert len(latest_events(5, tmp_path)[0]) == 2
+
+
+def test_a_row_still_being_written_waits_for_the_next_run(tmp_path):
+    write(tmp_path, HEADER + row(1), 'w')
+    update_session_rollups(tmp_path)
+
+    write(tmp_path, '2,Ada,Grace,2025-08-02,45,"Half a')
+    assert sessions(update_session_rollups(tmp_path)) == {('Ada', 'Grace'): 1}
+
+    write(tmp_path, '\nline"\n')
+    assert sessions(update_session_rollups(tmp_path)) == {('Ada', 'Grace'): 2}
+
+
+def test_a_final_row_without_newline_is_complete(tmp_path):
+    write(tmp_path, HEADER + row(1) + row(2).rstrip('\n'), 'w')
+    assert sessions(update_session_rollups(tmp_path)) == {('Ada', 'Grace'): 2}
+
+
+def test_a_rewritten_log_is_rebuilt_from_scratch(tmp_path):
+    write(tmp_path, HEADER + row(1) + row(2), 'w')
+    update_session_rollups(tmp_path)
+
+    write(tmp_path, HEADER + row(1, mentee='Alan'), 'w')
+    assert sessions(update_session_rollups(tmp_path)) == {('Ada', 'Alan'): 1}
+
+
+def test_concurrent_updates_count_each_row_once(tmp_path):
+    write(tmp_path, HEADER + row(1), 'w')
+    update_session_rollups(tmp_path)
+    write(tmp_path, ''.join(row(i) for i in range(2, 12)))
+
+    threads = [threading.Thread(target=update_session_rollups, args=(tmp_path,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sessions(load_state(tmp_path)) == {('Ada', 'Grace'): 11}
+    assert len(latest_events(20, tmp_path)[0]) == 10
+
+
+def test_participant_months_count_both_sides_of_a_pairing(tmp_path):
+    write(tmp_path, HEADER + row(1) + row(2, day='2025-09-03') + row(3, mentor='Alan', mentee='Ada'), 'w')
+    months = participant_months(update_session_rollups(tmp_path))
+    counts = {(name, str(month)): sessions for name, month, sessions in months.itertuples(index=False)}
+    assert counts == {('Ada', '2025-08'): 2, ('Ada', '2025-09'): 1, ('Alan', '2025-08'): 1,
+                      ('Grace', '2025-08'): 1, ('Grace', '2025-09'): 1}